@@ -1,48 +1,279 @@
-from flask import Flask, render_template, request, jsonify, session
-import requests
-from requests.exceptions import ChunkedEncodingError
+from flask import Flask, render_template, request, jsonify, session, g, has_request_context, url_for, send_from_directory
+import atexit
+import contextvars
+import copy
 import json
+import math
+import gzip
+import hashlib
+import mimetypes
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 import uuid
 import re
-from bs4 import BeautifulSoup
-from flask_cors import CORS
+import time
+import random
+import threading
+import sqlite3
+import sys
+import queue
+import logging
+import logging.handlers
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from flask.json.provider import DefaultJSONProvider
+import orjson
+# requests, numpy and bs4 are imported where they are first needed: this module is the
+# Vercel serverless entry point, and page routes should not pay for them on a cold start.
+
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify() backed by orjson, several times faster on large agent payloads.
+
+    Anything orjson can't encode (e.g. ints beyond 64 bits) goes through the
+    standard provider, so output stays compatible.
+    """
+
+    def _dumps_bytes(self, obj, sort_keys):
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        try:
+            return self._dumps_bytes(obj, kwargs.get('sort_keys', self.sort_keys)).decode('utf-8')
+        except TypeError:
+            return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        try:
+            body = self._dumps_bytes(obj, self.sort_keys)
+        except TypeError:
+            return super().response(obj)
+        return self._app.response_class(body, mimetype=self.mimetype)
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.secret_key = 'your-secret-key-here'
 app.config['SESSION_TYPE'] = 'filesystem'
 
-allowed_origins = [
-    "https://portal.qraptor.ai/",
-    "https://appzyjjakwlasqtu.qraptor.ai/"
-]
-
-#CORS(app, resources={r"/": {"origins": ""}})
-CORS(app, resources={r"/*": {"origins": "*"}})
-#CORS(app, origins=allowed_origins, supports_credentials=True)
-
 @app.after_request
 def after_request(response):
+    # Open CORS policy, same headers flask_cors produced with origins="*", without
+    # importing it on every cold start. Flask already answers OPTIONS preflights.
     origin = request.headers.get("Origin")
-    if origin in allowed_origins:
-        response.headers.add("Access-Control-Allow-Origin", origin)
-    response.headers.add("Access-Control-Allow-Headers", "Content-Type,Authorization")
-    response.headers.add("Access-Control-Allow-Methods", "GET,POST,PUT,DELETE,OPTIONS")
+    if origin:
+        response.headers["Access-Control-Allow-Origin"] = origin
+        response.vary.add("Origin")
+    else:
+        response.headers["Access-Control-Allow-Origin"] = "*"
+    if request.method == "OPTIONS":
+        response.headers["Access-Control-Allow-Headers"] = request.headers.get(
+            "Access-Control-Request-Headers", "Content-Type,Authorization")
+        response.headers["Access-Control-Allow-Methods"] = "DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+    else:
+        response.headers["Access-Control-Allow-Headers"] = "Content-Type,Authorization"
+        response.headers["Access-Control-Allow-Methods"] = "GET,POST,PUT,DELETE,OPTIONS"
     return response
 
 
-# Log every incoming request (method, path) to help debug routing
+# JSON responses at least this large are compressed when the client accepts it
+JSON_COMPRESS_MIN_BYTES = int(os.getenv('JSON_COMPRESS_MIN_BYTES', '1024'))
+JSON_GZIP_LEVEL = 6
+JSON_BROTLI_QUALITY = 5  # fast enough to run per response
+
+@app.after_request
+def _optimize_json_response(response):
+    """Strong ETag + 304 for GET JSON responses, then br/gzip above a size threshold."""
+    if (response.mimetype != 'application/json' or response.is_streamed
+            or response.status_code != 200 or 'Content-Encoding' in response.headers):
+        return response
+    data = response.get_data()
+    encoding = None
+    if len(data) >= JSON_COMPRESS_MIN_BYTES:
+        if request.accept_encodings['br'] and _brotli() is not None:
+            encoding = 'br'
+        elif request.accept_encodings['gzip']:
+            encoding = 'gzip'
+    if encoding or request.method in ('GET', 'HEAD'):
+        response.vary.add('Accept-Encoding')
+    if request.method in ('GET', 'HEAD'):
+        # Each encoding is a different representation, so it gets its own strong ETag
+        etag = hashlib.sha1(data).hexdigest() + (f'-{encoding}' if encoding else '')
+        response.set_etag(etag)
+        if request.if_none_match.contains(etag):
+            response.status_code = 304
+            response.set_data(b'')
+            return response
+    if encoding == 'br':
+        response.set_data(_brotli().compress(data, quality=JSON_BROTLI_QUALITY))
+    elif encoding == 'gzip':
+        response.set_data(gzip.compress(data, compresslevel=JSON_GZIP_LEVEL))
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+def _brotli():
+    """The brotli module, or None when it isn't installed (gzip is used instead)."""
+    if 'brotli' not in _optional_modules:
+        try:
+            import brotli
+        except ImportError:
+            brotli = None
+        _optional_modules['brotli'] = brotli
+    return _optional_modules['brotli']
+
+_optional_modules = {}
+
+# Also kept in a context variable so pool threads working for the request inherit it
+_request_deadline_var = contextvars.ContextVar('request_deadline', default=None)
+
 @app.before_request
-def _log_incoming_request():
+def _set_request_deadline():
+    # Upstream calls made while serving this request share one deadline
+    budget = REQUEST_DEADLINE
     try:
-        print(f"Incoming: {request.method} {request.path}", flush=True)
-    except Exception:
+        budget = min(budget, float(request.headers.get('X-Request-Timeout', budget)))
+    except ValueError:
         pass
+    g.deadline = time.monotonic() + budget
+    _request_deadline_var.set(g.deadline)
+
+
+# Structured logging. Records are JSON lines written to stdout by a background
+# listener thread, so request handlers only pay for a queue put. High-volume events
+# (per-request lines, SSE events) are sampled, and every record carries the ID of
+# the request it belongs to, which is also forwarded to Qraptor as X-Request-ID.
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+# Serverless instances are frozen between invocations, which would strand queued records
+LOG_ASYNC = os.getenv('LOG_ASYNC', '0' if os.getenv('VERCEL') else '1') == '1'
+LOG_PAYLOAD_MAX = int(os.getenv('LOG_PAYLOAD_MAX', '512'))  # characters kept per payload
+# Fraction of high-volume events that are logged; anything not listed is always logged
+LOG_SAMPLE_RATES = {
+    'request': float(os.getenv('LOG_SAMPLE_REQUESTS', '0.1')),
+    'sse_event': float(os.getenv('LOG_SAMPLE_SSE', '0.01')),
+}
+REQUEST_ID_HEADER = 'X-Request-ID'
+_REQUEST_ID_RE = re.compile(r'^[\w.:-]{1,64}$')
+
+_request_id = contextvars.ContextVar('request_id', default=None)
+_LOG_RECORD_FIELDS = set(logging.LogRecord('', 0, '', 0, '', None, None).__dict__) | {'message', 'request_id'}
+
+class _JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'request_id': getattr(record, 'request_id', None),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _LOG_RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return orjson.dumps(entry, default=str).decode('utf-8')
+
+class _RequestIdFilter(logging.Filter):
+    # Filters run in the thread that logs, before the record is queued
+    def filter(self, record):
+        record.request_id = _request_id.get()
+        return True
+
+class _BackgroundQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # Resolve the message and traceback now; JSON formatting happens on the listener thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+def _configure_logging() -> logging.Logger:
+    logger = logging.getLogger('influencer_app')
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(_JsonFormatter())
+    if LOG_ASYNC:
+        handler = _BackgroundQueueHandler(queue.SimpleQueue())
+        listener = logging.handlers.QueueListener(handler.queue, stream)
+        listener.start()
+        atexit.register(listener.stop)  # drain what is still queued on shutdown
+    else:
+        handler = stream
+    handler.addFilter(_RequestIdFilter())
+    logger.addHandler(handler)
+    return logger
+
+log = _configure_logging()
+
+def _sampled(event: str) -> bool:
+    rate = LOG_SAMPLE_RATES.get(event, 1.0)
+    return rate >= 1 or random.random() < rate
+
+def _summarize(payload, limit: int = None) -> str:
+    """A size-capped rendering of a payload for logs, never the whole body."""
+    limit = limit or LOG_PAYLOAD_MAX
+    text = payload if isinstance(payload, str) else orjson.dumps(payload, default=str).decode('utf-8')
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}... ({len(text)} chars)"
+
+def _with_request_context(fn):
+    """Wrap `fn` to run under the caller's request ID and deadline, for work handed to a pool."""
+    request_id = _request_id.get()
+    deadline = _request_deadline_var.get()
+
+    def run(*args, **kwargs):
+        id_token = _request_id.set(request_id)
+        deadline_token = _request_deadline_var.set(deadline)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _request_deadline_var.reset(deadline_token)
+            _request_id.reset(id_token)
+    return run
+
+@app.before_request
+def _log_incoming_request():
+    # Reuse a caller-supplied ID (e.g. from a load balancer) so traces line up end to end
+    inbound = request.headers.get(REQUEST_ID_HEADER, '')
+    g.request_id = inbound if _REQUEST_ID_RE.match(inbound) else uuid.uuid4().hex
+    g.request_started = time.monotonic()
+    _request_id.set(g.request_id)
+
+@app.after_request
+def _log_request_done(response):
+    request_id = g.get('request_id')
+    if request_id:
+        response.headers[REQUEST_ID_HEADER] = request_id
+    # Errors and slow requests are always logged; routine ones are sampled
+    duration_ms = round((time.monotonic() - g.get('request_started', time.monotonic())) * 1000, 1)
+    if response.status_code >= 400 or duration_ms >= 1000 or _sampled('request'):
+        log.info("%s %s %s", request.method, request.path, response.status_code,
+                 extra={'event': 'request', 'method': request.method, 'path': request.path,
+                        'status': response.status_code, 'duration_ms': duration_ms})
+    return response
+
+@app.teardown_request
+def _clear_request_id(exc):
+    # Sync workers reuse threads; don't let work outside the next request inherit this ID or deadline
+    _request_id.set(None)
+    _request_deadline_var.set(None)
 
 # Qraptor Platform Configuration
 QRAPTOR_BASE_URL = os.getenv('QRAPTOR_BASE_URL', 'https://appzyjjakwlasqtu.qraptor.ai')
 QRAPTOR_API_KEY = os.getenv('QRAPTOR_API_KEY', 'your-api-key-here')
+QRAPTOR_TOKEN_URL = os.getenv(
+    'QRAPTOR_TOKEN_URL',
+    'https://portal.qraptor.ai/auth1/realms/appzyjjakwlasqtu/protocol/openid-connect/token'
+)
 # Map logical agent names to their numeric controller IDs
 AGENT_ENDPOINTS = {
     'agent_1': '706',  # create campaign
@@ -50,6 +281,7 @@ AGENT_ENDPOINTS = {
     'agent_3': '712',  # add influencers to campaign
     'agent_4': '703',  # fetch campaign data
     'agent_5': '709',  # send mails
+    'influencer_search': '795',
     'analysis_agent': '715',
     'campaign_performance': '904',
     'influencer_performance': '906',
@@ -62,11 +294,314 @@ AGENT_ENDPOINTS = {
     'super_manager': '971'  # super manager chatbot
 }
 
-# Global variables to store data between agents
+# Read-only agents: safe to retry after a partial run (5xx, truncated SSE) and to
+# hedge with a second concurrent attempt. Everything else (campaign creation,
+# mail sending, ...) is only retried when the request never reached Qraptor.
+IDEMPOTENT_AGENTS = {
+    'agent_2',  # campaign listing
+    'agent_4',  # fetch campaign data
+    'analysis_agent',
+    'campaign_performance',
+    'influencer_performance',
+    'audience_insights',
+    'campaign_summary',
+    'influencer_summary',
+    'audience_summary',
+}
+_IDEMPOTENT_CONTROLLERS = {AGENT_ENDPOINTS[name] for name in IDEMPOTENT_AGENTS}
+
+# Agent call resilience policy
+AGENT_MAX_ATTEMPTS = int(os.getenv('AGENT_MAX_ATTEMPTS', '3'))
+AGENT_BACKOFF_BASE = float(os.getenv('AGENT_BACKOFF_BASE', '0.5'))  # seconds
+AGENT_BACKOFF_MAX = float(os.getenv('AGENT_BACKOFF_MAX', '8'))
+AGENT_ATTEMPT_TIMEOUT = float(os.getenv('AGENT_ATTEMPT_TIMEOUT', '60'))
+# Budget for a whole inbound request; clients may lower it with X-Request-Timeout (seconds)
+REQUEST_DEADLINE = float(os.getenv('REQUEST_DEADLINE', '90'))
+AGENT_HEDGING = os.getenv('AGENT_HEDGING', '1') == '1'
+AGENT_HEDGE_MIN_SAMPLES = int(os.getenv('AGENT_HEDGE_MIN_SAMPLES', '20'))
+
+# Global variables to store data between agents.
+# Guarded by _state_lock: under gevent workers the lock is monkey-patched into a
+# green lock, so the same code is safe for both sync/gthread and gevent workers.
 campaign = {}
 campaign_data = {}
 influencer_data = []
 campaign_analysis = {}
+_state_lock = threading.RLock()
+
+# Shared connection pool for every outbound call (Qraptor, Instagram, YouTube, CDN).
+# With gevent workers the sockets are cooperative, so one process can keep hundreds
+# of upstream requests in flight instead of one per worker.
+# Built on first use (see _http_session) so cold starts serving pages skip it.
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '100'))
+_http_clients = {}
+_http_clients_lock = threading.Lock()
+
+# Candidate enrichment (Instagram/YouTube lookups) runs concurrently per request.
+ENRICH_CONCURRENCY = int(os.getenv('ENRICH_CONCURRENCY', '10'))
+# Worker pools, also created on first use: 'enrich' for candidate enrichment and
+# 'agent' for racing a hedged second agent attempt against the first one.
+_POOL_SIZES = {'enrich': ENRICH_CONCURRENCY, 'agent': HTTP_POOL_SIZE}
+_pools = {}
+# Recent successful attempt latencies per controller, used for the hedging threshold
+_agent_latencies = {}
+_agent_latency_lock = threading.Lock()
+
+# Qraptor access tokens are reused until shortly before they expire
+_token_state = {'access_token': None, 'expires_at': 0.0}
+_token_lock = threading.Lock()
+
+# Bulkheads: every upstream class gets its own concurrency limit and bounded wait
+# queue, so a burst of image proxying or Instagram enrichment cannot starve the
+# Qraptor agent calls. Optional token-bucket rate limits are shared by all gunicorn
+# workers on the host through a small SQLite file.
+# Each value can be overridden with UPSTREAM_<NAME>_<KEY>, e.g. UPSTREAM_INSTAGRAM_RATE=1.
+UPSTREAM_LIMITS = {
+    #              concurrent  queued  queue wait (s)  rate (req/s)  burst
+    'qraptor':   {'concurrency': 50, 'queue': 200, 'queue_timeout': 15, 'rate': None, 'burst': None},
+    'token':     {'concurrency': 4, 'queue': 100, 'queue_timeout': 10, 'rate': None, 'burst': None},
+    'instagram': {'concurrency': 8, 'queue': 50, 'queue_timeout': 10, 'rate': 0.5, 'burst': 10},
+    # YouTube Data API: channels.list costs 1 quota unit; 10k units/day by default
+    'youtube':   {'concurrency': 8, 'queue': 50, 'queue_timeout': 10, 'rate': 1.0, 'burst': 20},
+    'image_cdn': {'concurrency': 16, 'queue': 32, 'queue_timeout': 5, 'rate': None, 'burst': None},
+}
+# Defaults to insyte-rate-limits.sqlite3 in the system temp dir
+RATE_LIMIT_DB = os.getenv('RATE_LIMIT_DB')
+
+class UpstreamRejected(RuntimeError):
+    """Raised when an upstream bulkhead or rate limit refuses a call."""
+
+    def __init__(self, upstream: str, reason: str):
+        super().__init__(f"{upstream} upstream busy ({reason})")
+        self.upstream = upstream
+        self.reason = reason
+
+class _SharedStore:
+    """Token buckets and counters in SQLite, shared by every worker process on the host.
+
+    One connection per process, shared under a lock: with gevent workers every request
+    is its own greenlet, so a thread-local connection would mean one per request. The
+    busy timeout is kept short because waiting on another process's write lock blocks
+    the whole event loop; a locked store counts as unavailable.
+    """
+
+    BUSY_TIMEOUT = 0.05  # seconds
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+
+    def _conn(self):
+        # Called with self._lock held; reconnect after a fork
+        if self._connection is None or self._pid != os.getpid():
+            if self.path is None:
+                import tempfile
+                self.path = os.path.join(tempfile.gettempdir(), 'insyte-rate-limits.sqlite3')
+            conn = sqlite3.connect(self.path, timeout=self.BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                # No fsync per commit (WAL stays consistent; a power cut may lose the last
+                # few updates, which is fine for rate-limit tokens and version counters)
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, tokens REAL, updated REAL)")
+                conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER)")
+            except sqlite3.Error:
+                conn.close()
+                raise
+            self._connection, self._pid = conn, os.getpid()
+        return self._connection
+
+    def take(self, name: str, rate: float, burst: float) -> float:
+        """Take one token; returns 0 on success, else seconds until one is available."""
+        with self._lock:
+            conn = self._conn()
+            now = time.time()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT tokens, updated FROM buckets WHERE name = ?", (name,)).fetchone()
+                tokens = burst if row is None else min(burst, row[0] + (now - row[1]) * rate)
+                wait_for = 0.0
+                if tokens >= 1:
+                    tokens -= 1
+                else:
+                    wait_for = (1 - tokens) / rate
+                conn.execute("INSERT OR REPLACE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)", (name, tokens, now))
+                conn.execute("COMMIT")
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+            return wait_for
+
+    def increment(self, name: str) -> int:
+        with self._lock:
+            conn = self._conn()
+            conn.execute("INSERT INTO counters (name, value) VALUES (?, 1) "
+                         "ON CONFLICT(name) DO UPDATE SET value = value + 1", (name,))
+            return conn.execute("SELECT value FROM counters WHERE name = ?", (name,)).fetchone()[0]
+
+    def counter(self, name: str) -> int:
+        with self._lock:
+            row = self._conn().execute("SELECT value FROM counters WHERE name = ?", (name,)).fetchone()
+            return row[0] if row else 0
+
+_shared_store = _SharedStore(RATE_LIMIT_DB)
+
+# Dataset version: bumped on every write to campaign/influencer/analysis data, here
+# or upstream. Cached Super Manager answers are scoped to the version they were
+# computed against, and the counter lives in the shared store so a write on one
+# worker invalidates every worker's cache. The local counter still moves if the
+# store is unavailable.
+_dataset_state = {'local': 0}
+
+def _bump_dataset_version():
+    with _state_lock:
+        _dataset_state['local'] += 1
+    try:
+        _shared_store.increment('dataset_version')
+    except sqlite3.Error as e:
+        log.warning("Dataset version store error: %s", e)
+
+def _dataset_version():
+    """The current version, or None when the shared store can't be read."""
+    try:
+        return _shared_store.counter('dataset_version'), _dataset_state['local']
+    except sqlite3.Error as e:
+        log.warning("Dataset version store error: %s", e)
+        return None
+
+class Bulkhead:
+    """Concurrency limit + bounded wait queue (+ optional shared rate limit) for one upstream."""
+
+    def __init__(self, name, concurrency, queue, queue_timeout, rate=None, burst=None):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_queue = queue
+        self.queue_timeout = queue_timeout
+        self.rate = rate
+        self.burst = burst or 1
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._lock = threading.Lock()
+        self.active = 0
+        self.waiting = 0
+        self.accepted = 0
+        self.rejected_queue_full = 0
+        self.rejected_queue_timeout = 0
+        self.rejected_rate_limit = 0
+
+    def acquire(self, deadline: float = None):
+        wait_until = time.monotonic() + self.queue_timeout
+        if deadline is not None:
+            wait_until = min(wait_until, deadline)
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                if self.waiting >= self.max_queue:
+                    self.rejected_queue_full += 1
+                    raise UpstreamRejected(self.name, 'queue full')
+                self.waiting += 1
+            try:
+                acquired = self._slots.acquire(timeout=max(wait_until - time.monotonic(), 0))
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+            if not acquired:
+                with self._lock:
+                    self.rejected_queue_timeout += 1
+                raise UpstreamRejected(self.name, 'queue timeout')
+        try:
+            self._wait_for_rate(wait_until)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self.active += 1
+            self.accepted += 1
+
+    def _wait_for_rate(self, wait_until: float):
+        if not self.rate:
+            return
+        while True:
+            try:
+                wait_for = _shared_store.take(self.name, self.rate, self.burst)
+            except sqlite3.Error as e:
+                # Never fail a request because the shared store is unavailable
+                log.warning("Rate limit store error (%s): %s", self.name, e, extra={'upstream': self.name})
+                return
+            if not wait_for:
+                return
+            if time.monotonic() + wait_for > wait_until:
+                with self._lock:
+                    self.rejected_rate_limit += 1
+                raise UpstreamRejected(self.name, 'rate limited')
+            time.sleep(wait_for)
+
+    def release(self):
+        with self._lock:
+            self.active -= 1
+        self._slots.release()
+
+    @contextmanager
+    def slot(self, deadline: float = None):
+        self.acquire(deadline)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'concurrency': self.concurrency,
+                'active': self.active,
+                'queue_depth': self.waiting,
+                'max_queue': self.max_queue,
+                'accepted': self.accepted,
+                'rejected': {
+                    'queue_full': self.rejected_queue_full,
+                    'queue_timeout': self.rejected_queue_timeout,
+                    'rate_limited': self.rejected_rate_limit,
+                },
+                'rate_per_sec': self.rate,
+            }
+
+def _upstream_setting(name: str, key: str, default):
+    value = os.getenv(f"UPSTREAM_{name.upper()}_{key.upper()}")
+    if value is None:
+        return default
+    return float(value) if key in ('queue_timeout', 'rate', 'burst') else int(value)
+
+UPSTREAMS = {
+    name: Bulkhead(name, **{key: _upstream_setting(name, key, default) for key, default in limits.items()})
+    for name, limits in UPSTREAM_LIMITS.items()
+}
+
+def _http_session():
+    """The shared pooled requests session (plus its adapter), created on first use."""
+    if 'session' not in _http_clients:
+        with _http_clients_lock:
+            if 'session' not in _http_clients:
+                import requests
+                from requests.adapters import HTTPAdapter
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+                client = requests.Session()
+                client.mount('https://', adapter)
+                client.mount('http://', adapter)
+                _http_clients['adapter'] = adapter
+                _http_clients['session'] = client
+    return _http_clients['session']
+
+def _pool(name: str) -> ThreadPoolExecutor:
+    if name not in _pools:
+        with _http_clients_lock:
+            if name not in _pools:
+                _pools[name] = ThreadPoolExecutor(max_workers=_POOL_SIZES[name], thread_name_prefix=name)
+    return _pools[name]
+
+def _upstream(name: str):
+    """Context manager holding a slot in the named upstream's bulkhead."""
+    return UPSTREAMS[name].slot(_request_deadline())
 
 APP_ID = "936619743392459"
 
@@ -85,8 +620,43 @@ def _parse_compact_number(s: str):
     mul = {"k": 1_000, "m": 1_000_000, "b": 1_000_000_000}.get(suf, 1)
     return int(num * mul)
 
+def _timeline_engagement(user: dict) -> dict:
+    """Engagement stats from the recent posts already embedded in web_profile_info."""
+    followers = (user.get("edge_followed_by") or {}).get("count") or 0
+    edges = (user.get("edge_owner_to_timeline_media") or {}).get("edges") or []
+    likes, comments, timestamps = [], [], []
+    for edge in edges:
+        node = edge.get("node") or {}
+        like_edge = node.get("edge_liked_by") or node.get("edge_media_preview_like") or {}
+        likes.append(like_edge.get("count") or 0)
+        comments.append((node.get("edge_media_to_comment") or {}).get("count") or 0)
+        if node.get("taken_at_timestamp"):
+            timestamps.append(node["taken_at_timestamp"])
+    if not likes:
+        return {"avg_likes": None, "avg_comments": None, "avg_engagement_rate": None,
+                "posts_per_week": None, "recent_media_count": 0}
+    avg_likes = sum(likes) / len(likes)
+    avg_comments = sum(comments) / len(comments)
+    posts_per_week = None
+    if len(timestamps) >= 2:
+        span_weeks = (max(timestamps) - min(timestamps)) / (7 * 24 * 3600)
+        # Intervals between posts, not post count, over the span they cover
+        posts_per_week = (len(timestamps) - 1) / span_weeks if span_weeks > 0 else None
+    return {
+        "avg_likes": round(avg_likes, 1),
+        "avg_comments": round(avg_comments, 1),
+        "avg_engagement_rate": round((avg_likes + avg_comments) / followers * 100, 2) if followers else None,
+        "posts_per_week": round(posts_per_week, 2) if posts_per_week is not None else None,
+        "recent_media_count": len(likes),
+    }
+
 def get_instagram_profile(username: str) -> dict:
+    # Own session for the cookie jar (the API call relies on cookies set by the page
+    # fetch), but pooled connections shared with the rest of the app.
+    import requests
+    _http_session()
     s = requests.Session()
+    s.mount('https://', _http_clients['adapter'])
     s.headers.update({
         "User-Agent": (
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -97,7 +667,8 @@ def get_instagram_profile(username: str) -> dict:
     })
 
     profile_url = f"https://www.instagram.com/{username}/"
-    page = s.get(profile_url, timeout=30)
+    with _upstream('instagram'):
+        page = s.get(profile_url, timeout=30)
     if page.status_code != 200:
         raise RuntimeError(f"Profile page fetch failed: {page.status_code}")
 
@@ -107,7 +678,8 @@ def get_instagram_profile(username: str) -> dict:
         "Accept": "application/json",
     })
     api_url = f"https://i.instagram.com/api/v1/users/web_profile_info/?username={username}"
-    api = s.get(api_url, timeout=30)
+    with _upstream('instagram'):
+        api = s.get(api_url, timeout=30)
 
     if api.status_code == 200 and "application/json" in api.headers.get("Content-Type", ""):
         j = api.json()
@@ -123,8 +695,11 @@ def get_instagram_profile(username: str) -> dict:
             "is_private": user.get("is_private"),
             "is_verified": user.get("is_verified"),
             "source": "web_profile_info",
+            **_timeline_engagement(user),
         }
 
+    # Only this fallback path needs bs4, so it is imported here rather than at startup
+    from bs4 import BeautifulSoup
     soup = BeautifulSoup(page.text, "html.parser")
     og_title = soup.find("meta", property="og:title")
     og_image = soup.find("meta", property="og:image")
@@ -160,6 +735,18 @@ def get_instagram_profile(username: str) -> dict:
 
     return result
 
+def _busy_response(e: UpstreamRejected):
+    resp = jsonify({'success': False, 'message': str(e), 'upstream': e.upstream})
+    resp.status_code = 503
+    resp.headers['Retry-After'] = '5'
+    return resp
+
+@app.route('/api/upstream_stats', methods=['GET'])
+def upstream_stats():
+    # Counters are per worker process; rate-limit buckets are shared by all workers
+    return jsonify({'success': True, 'pid': os.getpid(),
+                    'upstreams': {name: bulkhead.stats() for name, bulkhead in UPSTREAMS.items()}})
+
 @app.route('/api/instagram_profile', methods=['GET'])
 def api_instagram_profile():
     try:
@@ -168,6 +755,8 @@ def api_instagram_profile():
             return jsonify({'success': False, 'message': 'username is required'}), 400
         data = get_instagram_profile(username)
         return jsonify({'success': True, 'profile': data})
+    except UpstreamRejected as e:
+        return _busy_response(e)
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
@@ -178,8 +767,9 @@ def get_youtube_channel(channel_id: str, api_key: str = None) -> dict:
         "https://www.googleapis.com/youtube/v3/channels"
         f"?part=snippet,statistics&id={channel_id}&key={key}"
     )
-    resp = requests.get(url, timeout=20)
-    data = resp.json()
+    with _upstream('youtube'):
+        resp = _http_session().get(url, timeout=20)
+        data = resp.json()
     if "items" in data and len(data["items"]) > 0:
         ch = data["items"][0]
         snippet = ch.get("snippet", {})
@@ -205,6 +795,8 @@ def api_youtube_channel():
             return jsonify({'success': False, 'message': 'channel_id is required'}), 400
         info = get_youtube_channel(channel_id)
         return jsonify({'success': True, 'channel': info})
+    except UpstreamRejected as e:
+        return _busy_response(e)
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
@@ -214,21 +806,63 @@ def proxy_image():
         image_url = request.args.get('url', '')
         if not image_url or not image_url.startswith('http'):
             return jsonify({'success': False, 'message': 'invalid url'}), 400
-        # Basic safety: cap size and timeouts
-        resp = requests.get(image_url, timeout=15, stream=True, headers={
-            'User-Agent': 'Mozilla/5.0',
-            'Accept': 'image/avif,image/webp,image/apng,image/*,*/*;q=0.8',
-            'Referer': 'https://www.instagram.com/'
-        })
+        # The CDN slot is held until the body has been streamed to the client
+        bulkhead = UPSTREAMS['image_cdn']
+        bulkhead.acquire(_request_deadline())
+        try:
+            # Basic safety: cap size and timeouts
+            resp = _http_session().get(image_url, timeout=15, stream=True, headers={
+                'User-Agent': 'Mozilla/5.0',
+                'Accept': 'image/avif,image/webp,image/apng,image/*,*/*;q=0.8',
+                'Referer': 'https://www.instagram.com/'
+            })
+        except Exception:
+            bulkhead.release()
+            raise
         if resp.status_code != 200:
+            resp.close()
+            bulkhead.release()
             return jsonify({'success': False, 'message': f'fetch failed {resp.status_code}'}), 502
         content_type = resp.headers.get('Content-Type', 'image/jpeg')
-        return app.response_class(resp.iter_content(chunk_size=4096), mimetype=content_type)
+
+        released = threading.Event()
+
+        def release():
+            # Runs when the WSGI server closes the response: after the body was sent, on a
+            # client disconnect, or for HEAD, where the body iterator is never started
+            # (so a generator `finally` would never run). Guarded so it happens once.
+            if not released.is_set():
+                released.set()
+                resp.close()
+                bulkhead.release()
+
+        response = app.response_class(resp.iter_content(chunk_size=4096), mimetype=content_type)
+        response.call_on_close(release)
+        return response
+    except UpstreamRejected as e:
+        return _busy_response(e)
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
-def get_access_token():
-    token_url = "https://portal.qraptor.ai/auth1/realms/appzyjjakwlasqtu/protocol/openid-connect/token"
+class AgentCallError(RuntimeError):
+    """A failed agent attempt, classified by `kind` for the retry policy.
+
+    'connection' means the request never reached Qraptor (safe to retry for any agent);
+    'server', 'timeout' and 'truncated' mean it may have run (retried only for
+    IDEMPOTENT_AGENTS); 'client', 'rejected' (local bulkhead full) and 'cancelled'
+    are never retried.
+    """
+
+    def __init__(self, message, kind='client'):
+        super().__init__(message)
+        self.kind = kind
+
+    def retryable(self, idempotent: bool) -> bool:
+        if self.kind == 'connection':
+            return True
+        return idempotent and self.kind in ('server', 'timeout', 'truncated')
+
+def _fetch_access_token():
     payload = {
         "username": os.getenv("QRAPTOR_USERNAME"),
         "password": os.getenv("QRAPTOR_PASSWORD"),
@@ -237,56 +871,301 @@ def get_access_token():
         "client_secret": os.getenv("QRAPTOR_CLIENT_SECRET")
     }
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
-    response = requests.post(token_url, data=payload, headers=headers)
+    with _upstream('token'):
+        response = _http_session().post(QRAPTOR_TOKEN_URL, data=payload, headers=headers, timeout=20)
     if response.status_code == 200:
         token_data = response.json()
         access_token = token_data.get("access_token")
-        return access_token
+        if not access_token:
+            raise RuntimeError("Auth response missing access_token")
+        # Refresh 30 s early so a token never expires mid-call
+        expires_in = float(token_data.get("expires_in") or 300)
+        return access_token, time.monotonic() + max(expires_in - 30, 0)
     else:
         raise RuntimeError(f"Error getting token: {response.text}")
 
-def call_agent(controller_id: str, input_data: dict):
-    access_token = get_access_token()
-    api_url = f"{QRAPTOR_BASE_URL}/api/{controller_id}/agent-controller/trigger-agent"
-    api_headers = {
+def get_access_token(force_refresh: bool = False):
+    with _token_lock:
+        if not force_refresh and _token_state['access_token'] and time.monotonic() < _token_state['expires_at']:
+            return _token_state['access_token']
+        access_token, expires_at = _fetch_access_token()
+        _token_state['access_token'] = access_token
+        _token_state['expires_at'] = expires_at
+        return access_token
+
+def _agent_url(controller_id: str) -> str:
+    return f"{QRAPTOR_BASE_URL}/api/{controller_id}/agent-controller/trigger-agent"
+
+def _agent_headers(access_token: str) -> dict:
+    headers = {
         "Authorization": f"Bearer {access_token}",
         "Content-Type": "application/json"
     }
-    # Try normal JSON response first
+    request_id = _request_id.get()
+    if request_id:
+        headers[REQUEST_ID_HEADER] = request_id
+    return headers
+
+def _iter_sse_json(response):
+    """Yield decoded JSON payloads from a Qraptor SSE stream, skipping non-JSON lines."""
+    return _parse_sse_lines(response.iter_lines())
+
+def _parse_sse_lines(lines):
+    for line in lines:
+        if not line:
+            continue
+        text = line.decode("utf-8", errors="replace")
+        # Accept both raw JSON and prefixed lines
+        if text.startswith("SSE Event: data: "):
+            text = text.replace("SSE Event: data: ", "", 1)
+        elif text.startswith("data:"):
+            text = text.replace("data:", "", 1).strip()
+        try:
+            yield json.loads(text)
+        except json.JSONDecodeError:
+            continue
+
+def _request_deadline():
+    if has_request_context() and 'deadline' in g:
+        return g.deadline
+    # Pool threads have no request context but carry the deadline (see _with_request_context)
+    return _request_deadline_var.get() or time.monotonic() + REQUEST_DEADLINE
+
+def _record_agent_latency(controller_id: str, seconds: float):
+    with _agent_latency_lock:
+        _agent_latencies.setdefault(controller_id, deque(maxlen=200)).append(seconds)
+
+def _agent_p95(controller_id: str):
+    with _agent_latency_lock:
+        samples = sorted(_agent_latencies.get(controller_id) or ())
+    if len(samples) < AGENT_HEDGE_MIN_SAMPLES:
+        return None
+    return samples[int(len(samples) * 0.95) - 1]
+
+def _agent_attempt(controller_id: str, input_data: dict, timeout: float, cancelled: threading.Event):
+    """One trigger-agent call. Returns the JSON result or raises AgentCallError.
+
+    A single streamed POST serves both response styles: plain JSON bodies are decoded
+    directly, SSE bodies are parsed until the event carrying `outputs` arrives.
+    """
+    import requests
+    from requests.exceptions import ChunkedEncodingError
     try:
-        resp = requests.post(api_url, headers=api_headers, json=input_data, timeout=45)
-        if resp.ok:
+        access_token = get_access_token()
+    except UpstreamRejected as e:
+        raise AgentCallError(str(e), kind='rejected')
+    except requests.RequestException as e:
+        raise AgentCallError(f"token request failed: {e}", kind='connection')
+    try:
+        with _upstream('qraptor'):
+            started = time.monotonic()
             try:
-                return resp.json()
-            except ValueError:
-                pass
-    except Exception as e:
-        print(f"Non-stream call error: {e}")
+                response = _http_session().post(_agent_url(controller_id), headers=_agent_headers(access_token),
+                                                json=input_data, stream=True, timeout=(min(10, timeout), timeout))
+            except requests.ReadTimeout as e:
+                # The request went out; the agent may be running
+                raise AgentCallError(f"agent timed out: {e}", kind='timeout')
+            except requests.ConnectionError as e:
+                # Connect/send failures: no response status, so Qraptor never accepted the call
+                raise AgentCallError(f"agent connection failed: {e}", kind='connection')
+            with response:
+                if response.status_code == 401:
+                    # Token revoked or expired early; the next attempt fetches a fresh one
+                    # (the agent never ran, so this is as safe to retry as a connection error)
+                    get_access_token(force_refresh=True)
+                    raise AgentCallError("agent rejected access token", kind='connection')
+                if response.status_code >= 500:
+                    raise AgentCallError(f"agent returned {response.status_code}", kind='server')
+                if not response.ok:
+                    raise AgentCallError(f"agent returned {response.status_code}: {response.text[:200]}")
+                # From here the agent has accepted the call, so a failure reading the body
+                # is a timeout or truncation (retried only for idempotent agents), never 'connection'
+                try:
+                    terminal = _read_agent_body(controller_id, response, cancelled)
+                except ChunkedEncodingError as e:
+                    raise AgentCallError(f"agent stream truncated: {e}", kind='truncated')
+                except requests.RequestException as e:
+                    # requests reports a read timeout mid-body as ConnectionError
+                    raise AgentCallError(f"agent timed out reading response: {e}", kind='timeout')
+    except UpstreamRejected as e:
+        # Shedding load: retrying would only deepen the queue
+        raise AgentCallError(str(e), kind='rejected')
+    elapsed = time.monotonic() - started
+    _record_agent_latency(controller_id, elapsed)
+    log.debug("Agent %s responded in %.2fs", controller_id, elapsed,
+              extra={'event': 'agent_call', 'controller_id': controller_id, 'duration_ms': round(elapsed * 1000, 1)})
+    return terminal
+
+def _read_agent_body(controller_id: str, response, cancelled: threading.Event):
+    """Decode a trigger-agent body: a plain JSON document, or SSE ending in an `outputs` event.
+
+    A stream cut off before `outputs` is 'truncated'. One that closes cleanly without
+    `outputs` (e.g. a final `{"success": true}` event) returns its last event, as
+    before; only idempotent agents treat that as 'truncated' to get a retry, since the
+    others can't be retried and have already run.
+    """
+    from requests.exceptions import ChunkedEncodingError
+    cut_off = False
+    if 'text/event-stream' in response.headers.get('Content-Type', ''):
+        events = _iter_sse_json(response)
+    else:
+        buffered = bytearray()
+        try:
+            for chunk in response.iter_content(64 * 1024):
+                buffered += chunk
+        except ChunkedEncodingError:
+            # Abrupt close after the payload: parse what arrived, like the SSE path below
+            log.debug("Agent body ended early (server closed connection)", extra={'controller_id': controller_id})
+            cut_off = True
+        try:
+            return json.loads(bytes(buffered))
+        except ValueError:
+            # Unlabelled SSE
+            events = _parse_sse_lines(bytes(buffered).splitlines())
 
-    # Fallback to SSE stream parsing
+    terminal = last_event = None
     try:
-        with requests.post(api_url, headers=api_headers, json=input_data, stream=True, timeout=60) as response:
-            last_json = None
-            for line in response.iter_lines():
-                if line:
-                    text = line.decode("utf-8")
-                    print("SSE Event:", text)
-                    # Accept both raw JSON and prefixed lines
-                    if text.startswith("SSE Event: data: "):
-                        text = text.replace("SSE Event: data: ", "", 1)
-                    elif text.startswith("data:"):
-                        text = text.replace("data:", "", 1).strip()
-                    try:
-                        last_json = json.loads(text)
-                    except json.JSONDecodeError:
-                        continue
-            return last_json
+        for event in events:
+            if log.isEnabledFor(logging.DEBUG) and _sampled('sse_event'):
+                log.debug("SSE event", extra={'event': 'sse_event', 'controller_id': controller_id,
+                                              'payload': _summarize(event)})
+            last_event = event
+            if isinstance(event, dict) and event.get('outputs'):
+                terminal = event
+            if cancelled.is_set():
+                raise AgentCallError("superseded by hedged attempt", kind='cancelled')
     except ChunkedEncodingError:
-        print("SSE stream ended (server closed connection).")
-        return None
-    except Exception as e:
-        print(f"Stream call error: {e}")
-        return None
+        # Expected with SSE when the server closes the connection
+        log.debug("SSE stream ended (server closed connection)", extra={'controller_id': controller_id})
+        cut_off = True
+    if terminal is not None:
+        return terminal
+    if last_event is None:
+        raise AgentCallError("SSE stream ended without any event", kind='truncated')
+    if cut_off:
+        raise AgentCallError("SSE stream cut off before an outputs event", kind='truncated')
+    if controller_id in _IDEMPOTENT_CONTROLLERS:
+        raise AgentCallError("SSE stream ended without an outputs event", kind='truncated')
+    return last_event
+
+def _hedged_attempt(controller_id: str, input_data: dict, timeout: float):
+    """Run an attempt; if it outlives the controller's p95 latency, race a second one."""
+    cancelled = threading.Event()
+    threshold = _agent_p95(controller_id) if AGENT_HEDGING else None
+    if threshold is None or threshold >= timeout:
+        return _agent_attempt(controller_id, input_data, timeout, cancelled)
+
+    deadline = time.monotonic() + timeout
+    futures = [_pool('agent').submit(_with_request_context(_agent_attempt), controller_id, input_data, timeout, cancelled)]
+    done, _ = wait(futures, timeout=threshold)
+    if not done:
+        log.info("Hedging agent %s after %.2fs", controller_id, threshold, extra={'controller_id': controller_id})
+        futures.append(_pool('agent').submit(_with_request_context(_agent_attempt), controller_id, input_data,
+                                          max(deadline - time.monotonic(), 1), cancelled))
+    error = None
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, timeout=max(deadline - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        for future in done:
+            try:
+                result = future.result()
+            except AgentCallError as e:
+                error = e
+                continue
+            cancelled.set()  # tell the slower attempt to stop reading its stream
+            return result
+    cancelled.set()
+    raise error or AgentCallError("agent call exceeded deadline", kind='timeout')
+
+def call_agent(controller_id: str, input_data: dict, deadline: float = None):
+    """Trigger a Qraptor agent with retries, jittered backoff and optional hedging.
+
+    `controller_id` may be a numeric controller ID or a key of AGENT_ENDPOINTS.
+    Gives up at `deadline` (monotonic time, defaults to the inbound request's
+    deadline) and returns None when every attempt failed, as before.
+    """
+    controller_id = AGENT_ENDPOINTS.get(controller_id, controller_id)
+    idempotent = controller_id in _IDEMPOTENT_CONTROLLERS
+    deadline = deadline or _request_deadline()
+    attempt = 0
+    while True:
+        attempt += 1
+        remaining = deadline - time.monotonic()
+        if remaining <= 1:
+            log.warning("Agent %s: request deadline exhausted after %d attempt(s)", controller_id, attempt - 1,
+                        extra={'controller_id': controller_id})
+            return None
+        timeout = min(AGENT_ATTEMPT_TIMEOUT, remaining)
+        try:
+            if idempotent:
+                return _hedged_attempt(controller_id, input_data, timeout)
+            return _agent_attempt(controller_id, input_data, timeout, threading.Event())
+        except AgentCallError as e:
+            log.warning("Agent %s attempt %d failed: %s", controller_id, attempt, e,
+                        extra={'controller_id': controller_id, 'kind': e.kind})
+            if not e.retryable(idempotent) or attempt >= AGENT_MAX_ATTEMPTS:
+                return None
+        except Exception as e:
+            log.exception("Agent %s call error: %s", controller_id, e, extra={'controller_id': controller_id})
+            return None
+        # Full jitter exponential backoff, never sleeping past the deadline
+        backoff = random.uniform(0, min(AGENT_BACKOFF_MAX, AGENT_BACKOFF_BASE * 2 ** (attempt - 1)))
+        time.sleep(max(min(backoff, deadline - time.monotonic() - 1), 0))
+
+# Fingerprinted assets written by scripts/build_assets.py. Templates call asset_url()
+# instead of url_for('static', ...); without a build it falls back to the source files.
+STATIC_DIST_DIR = os.path.join(app.static_folder, 'dist')
+ASSET_MAX_AGE = 365 * 24 * 3600
+# Precompressed variants in preference order
+ASSET_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+_asset_manifest = {}
+
+def _load_asset_manifest() -> dict:
+    # Cached for the life of the process; re-read in debug so rebuilds show up
+    if 'entries' not in _asset_manifest or app.debug:
+        try:
+            with open(os.path.join(STATIC_DIST_DIR, 'manifest.json')) as f:
+                _asset_manifest['entries'] = json.load(f)
+        except (OSError, ValueError):
+            _asset_manifest['entries'] = {}
+    return _asset_manifest['entries']
+
+def asset_url(filename: str) -> str:
+    hashed = _load_asset_manifest().get(filename)
+    if hashed:
+        return url_for('hashed_asset', filename=hashed)
+    return url_for('static', filename=filename)
+
+def asset_variant(filename: str, ext: str):
+    """URL of a built variant (e.g. 'webp') of a static file, or None if there is none."""
+    hashed = _load_asset_manifest().get(f"{os.path.splitext(filename)[0]}.{ext}")
+    return url_for('hashed_asset', filename=hashed) if hashed else None
+
+@app.context_processor
+def _asset_helpers():
+    return {'asset_url': asset_url, 'asset_variant': asset_variant}
+
+@app.route('/static/dist/<path:filename>')
+def hashed_asset(filename):
+    # Hashed names change whenever content does, so they can be cached forever
+    response = None
+    for encoding, suffix in ASSET_ENCODINGS:
+        if request.accept_encodings[encoding] and os.path.isfile(os.path.join(STATIC_DIST_DIR, filename + suffix)):
+            response = send_from_directory(STATIC_DIST_DIR, filename + suffix,
+                                           mimetype=mimetypes.guess_type(filename)[0],
+                                           download_name=os.path.basename(filename))
+            response.headers['Content-Encoding'] = encoding
+            break
+    if response is None:
+        response = send_from_directory(STATIC_DIST_DIR, filename)
+    response.vary.add('Accept-Encoding')
+    response.cache_control.no_cache = None
+    response.cache_control.public = True
+    response.cache_control.max_age = ASSET_MAX_AGE
+    response.cache_control.immutable = True
+    return response
 
 @app.route('/')
 def index():
@@ -308,71 +1187,71 @@ def analysis():
 def super_manager():
     return render_template('super-manager.html')
 
+def _request_param(name: str):
+    """A response-shaping option from the query string, or from the JSON body for POSTs."""
+    if name in request.args:
+        return request.args.get(name)
+    body = request.get_json(silent=True) if request.method == 'POST' else None
+    return body.get(name) if isinstance(body, dict) else None
+
+def _requested_fields():
+    fields = _request_param('fields')
+    if not fields:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(',')
+    return [str(f).strip() for f in fields if str(f).strip()]
+
+def _include_raw() -> bool:
+    value = _request_param('include_raw')
+    if value is None:
+        return True  # the Super Manager page reads `raw`
+    return str(value).strip().lower() not in ('0', 'false', 'no', 'off')
+
+def _project(record, fields):
+    if not fields or not isinstance(record, dict):
+        return record
+    return {key: record[key] for key in fields if key in record}
+
+def _paginate(items: list):
+    """Slice a collection by ?limit=&offset=; returns (page, pagination metadata or None)."""
+    limit, offset = _request_param('limit'), _request_param('offset')
+    if limit is None and offset is None:
+        return items, None
+    try:
+        offset = int(offset or 0)
+        limit = int(limit) if limit is not None else max(len(items) - offset, 1)
+    except (TypeError, ValueError):
+        raise ValueError('limit and offset must be integers')
+    # limit 0 would hand back next_offset == offset and loop a client forever
+    if limit < 1 or offset < 0:
+        raise ValueError('limit must be at least 1 and offset non-negative')
+    page = items[offset:offset + limit]
+    next_offset = offset + limit if offset + limit < len(items) else None
+    return page, {'limit': limit, 'offset': offset, 'total': len(items), 'next_offset': next_offset}
+
 @app.route('/api/list_campaigns', methods=['GET'])
 def list_campaigns():
     try:
-        # Use the QRaptor API to fetch campaigns
-        token_url = "https://portal.qraptor.ai/auth1/realms/appzyjjakwlasqtu/protocol/openid-connect/token"
-        
-        payload = {
-        "username": os.getenv("QRAPTOR_USERNAME"),
-        "password": os.getenv("QRAPTOR_PASSWORD"),
-        "grant_type": "password",
-        "client_id": os.getenv("QRAPTOR_CLIENT_ID"),
-        "client_secret": os.getenv("QRAPTOR_CLIENT_SECRET")
-    }
-        
-        headers = {"Content-Type": "application/x-www-form-urlencoded"}
-
-        # Get access token and call controller 732 using the new method
-        response = requests.post(token_url, data=payload, headers=headers, timeout=20)
-        if response.status_code == 200:
-            token_data = response.json()
-            access_token = token_data.get("access_token")
-            print(f"Access token acquired: len={len(access_token) if access_token else 0}")
-            if not access_token:
-                return jsonify({'success': False, 'message': 'Auth response missing access_token'}), 502
-            # Use SSE print-style as per tested code, but also parse campaigns
-            campaigns = []
-            api_url = f"{QRAPTOR_BASE_URL}/api/732/agent-controller/trigger-agent"
-            api_headers = {
-                "Authorization": f"Bearer {access_token}",
-                "Content-Type": "application/json"
-            }
-            try:
-                with requests.post(api_url, headers=api_headers, json={}, stream=True) as sse_resp:
-                    for line in sse_resp.iter_lines():
-                        if line:
-                            text = line.decode("utf-8")
-                            # print("SSE Event:", text)
-                            payload_text = text
-                            if text.startswith("SSE Event: data: "):
-                                payload_text = text.replace("SSE Event: data: ", "", 1)
-                            elif text.startswith("data:"):
-                                payload_text = text.replace("data:", "", 1).strip()
-                            try:
-                                j = json.loads(payload_text)
-                                rows = j.get("outputs", {}).get("res_rows")
-                                if rows:
-                                    campaigns = rows
-                                    break
-                            except json.JSONDecodeError:
-                                continue
-            except ChunkedEncodingError:
-                print("SSE stream ended (server closed connection).")
-            except Exception as e:
-                print(f"Error calling campaign API: {e}")
-                return jsonify({'success': False, 'message': f'Failed to fetch campaigns: {str(e)}'}), 500
-
-            if campaigns:
-                print(campaigns)
-                print(f"[CAMPAIGNS] Found {len(campaigns)} campaigns from QRaptor")
-                print(f"[CAMPAIGNS] Sample campaign structure: {campaigns[0] if campaigns else 'None'}")
-                return jsonify({'success': True, 'campaigns': campaigns})
-            return jsonify({'success': False, 'message': 'No campaigns found'}), 404
-        else:
-            return jsonify({'success': False, 'message': 'Failed to get access token'}), 500
-            
+        # Controller 732 streams the campaign rows; call_agent retries/hedges it
+        result = call_agent(AGENT_ENDPOINTS['agent_2'], {})
+        if result is None:
+            return jsonify({'success': False, 'message': 'Failed to fetch campaigns from QRaptor'}), 502
+        campaigns = (result.get("outputs") or {}).get("res_rows") if isinstance(result, dict) else None
+
+        if campaigns:
+            log.info("Found %d campaigns from QRaptor", len(campaigns), extra={'count': len(campaigns)})
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Sample campaign structure", extra={'payload': _summarize(campaigns[0])})
+            page, pagination = _paginate(campaigns)
+            fields = _requested_fields()
+            body = {'success': True, 'campaigns': [_project(c, fields) for c in page]}
+            if pagination:
+                body['pagination'] = pagination
+            return jsonify(body)
+        return jsonify({'success': False, 'message': 'No campaigns found'}), 404
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
@@ -394,69 +1273,247 @@ def create_campaign():
         
         # Store in local memory for now
         campaign_id = str(uuid.uuid4())
-        campaign_data[campaign_id] = campaign_record
+        with _state_lock:
+            campaign_data[campaign_id] = campaign_record
+        _bump_dataset_version()
         
         # Try to create via QRaptor API
         try:
-            token_url = "https://portal.qraptor.ai/auth1/realms/appzyjjakwlasqtu/protocol/openid-connect/token"
-            
-            payload = {
-        "username": os.getenv("QRAPTOR_USERNAME"),
-        "password": os.getenv("QRAPTOR_PASSWORD"),
-        "grant_type": "password",
-        "client_id": os.getenv("QRAPTOR_CLIENT_ID"),
-        "client_secret": os.getenv("QRAPTOR_CLIENT_SECRET")
-    }
+            try:
+                access_token = get_access_token()
+            except RuntimeError:
+                # Fallback to local creation if API fails
+                return jsonify({'success': True, 'campaign_id': campaign_id, 'message': 'Campaign created locally (API unavailable)'})
             
-            headers = {"Content-Type": "application/x-www-form-urlencoded"}
+            # Call the create campaign API (agent_1)
+            api_url = _agent_url(AGENT_ENDPOINTS['agent_1'])
             
-            # Get access token
-            response = requests.post(token_url, data=payload, headers=headers)
+            # Prepare campaign data for the API
+            api_payload = {
+                "campaign_data": campaign_record,
+                "action": "create_campaign"
+            }
             
-            if response.status_code == 200:
-                token_data = response.json()
-                access_token = token_data["access_token"]
+            with _upstream('qraptor'), _http_session().post(api_url, headers=_agent_headers(access_token), json=api_payload, stream=True, timeout=60) as response:
+                for json_data in _iter_sse_json(response):
+                    if isinstance(json_data, dict) and json_data.get("success"):
+                        return jsonify({'success': True, 'campaign_id': campaign_id, 'message': 'Campaign created successfully'})
                 
-                # Call the create campaign API (agent_1)
-                api_url = "https://appzyjjakwlasqtu.qraptor.ai/api/706/agent-controller/trigger-agent"
-                api_headers = {
-                    "Authorization": f"Bearer {access_token}",
-                    "Content-Type": "application/json"
-                }
-                
-                # Prepare campaign data for the API
-                api_payload = {
-                    "campaign_data": campaign_record,
-                    "action": "create_campaign"
-                }
-                
-                with requests.post(api_url, headers=api_headers, json=api_payload, stream=True) as response:
-                    for line in response.iter_lines():
-                        if line:
-                            line_data = line.decode("utf-8")
-                            if line_data.startswith("SSE Event: data: "):
-                                try:
-                                    json_data = json.loads(line_data.replace("SSE Event: data: ", ""))
-                                    if json_data.get("success"):
-                                        return jsonify({'success': True, 'campaign_id': campaign_id, 'message': 'Campaign created successfully'})
-                                except json.JSONDecodeError:
-                                    continue
-                    
-                    # If no successful response from API, return local success
-                    return jsonify({'success': True, 'campaign_id': campaign_id, 'message': 'Campaign created locally'})
-                    
-            else:
-                # Fallback to local creation if API fails
-                return jsonify({'success': True, 'campaign_id': campaign_id, 'message': 'Campaign created locally (API unavailable)'})
+                # If no successful response from API, return local success
+                return jsonify({'success': True, 'campaign_id': campaign_id, 'message': 'Campaign created locally'})
                 
         except Exception as e:
-            print(f"Error creating campaign via API: {e}")
+            log.warning("Error creating campaign via API: %s", e)
             # Fallback to local creation
             return jsonify({'success': True, 'campaign_id': campaign_id, 'message': 'Campaign created locally (API error)'})
             
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
+def _lifetime_posts_per_week(count, published_at):
+    """Average upload cadence over a channel's lifetime, from data get_youtube_channel returned."""
+    try:
+        started = datetime.fromisoformat(str(published_at).replace('Z', '+00:00'))
+        weeks = (datetime.now(started.tzinfo) - started).total_seconds() / (7 * 24 * 3600)
+        return round(int(count) / weeks, 2) if weeks > 0 else None
+    except (TypeError, ValueError):
+        return None
+
+# Ranking weights for rank_influencers(); requests may override them via `ranking_weights`.
+RANKING_WEIGHTS = {
+    'brand_fit': 0.40,         # agent's brand_fit_score
+    'engagement': 0.30,        # (likes + comments) / followers over recent posts
+    'reach': 0.15,             # log followers
+    'audience_quality': 0.10,  # log follower/following ratio
+    'cadence': 0.05,           # posts per week, capped
+}
+RANKING_CADENCE_CAP = 7.0  # posts/week beyond this earn no extra credit
+MAX_RANK_CANDIDATES = int(os.getenv('MAX_RANK_CANDIDATES', '200'))
+# Profile lookups per query; lowered further to fit the Instagram/YouTube rate limits
+ENRICH_BUDGET = int(os.getenv('ENRICH_BUDGET', '10'))
+DEFAULT_RESULT_LIMIT = 10
+
+def _ranking_weights(overrides: dict = None) -> dict:
+    weights = dict(RANKING_WEIGHTS)
+    for key, value in (overrides or {}).items():
+        if key in weights:
+            try:
+                weights[key] = max(float(value), 0.0)
+            except (TypeError, ValueError):
+                pass
+    total = sum(weights.values()) or 1.0
+    return {key: value / total for key, value in weights.items()}
+
+def _column(candidates, key):
+    import numpy as np
+    return np.array([c.get(key) if isinstance(c.get(key), (int, float)) else np.nan for c in candidates], dtype=float)
+
+def rank_influencers(candidates: list, weights: dict = None) -> list:
+    """Score and sort a whole candidate batch at once.
+
+    Each feature is min-max scaled across the batch; a candidate missing a feature
+    (e.g. engagement for a meta-tag fallback profile) gets the batch median, so it
+    is neither rewarded nor punished for it. Adds `rank_score` (0-100) to every
+    candidate and returns them best first.
+    """
+    if not candidates:
+        return []
+    import numpy as np
+    w = _ranking_weights(weights)
+    followers = _column(candidates, 'followers')
+    following = _column(candidates, 'following')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        features = np.column_stack([
+            _column(candidates, 'brand_fit_score'),
+            _column(candidates, 'avg_engagement_rate'),
+            # maximum/minimum (not fmax/fmin) keep NaN, so missing values get the median below
+            np.log10(np.maximum(followers, 0) + 1),
+            np.where(following > 0, np.log10((followers + 1) / following), np.nan),
+            np.minimum(_column(candidates, 'posts_per_week'), RANKING_CADENCE_CAP),
+        ])
+        known = ~np.isnan(features)
+        # Columns nobody has (e.g. engagement in an all-YouTube batch) collapse to 0
+        medians = np.nanmedian(np.where(known.any(axis=0), features, 0), axis=0)
+        features = np.where(known, features, medians)
+        lo, hi = features.min(axis=0), features.max(axis=0)
+        spread = hi - lo
+        # A feature that is constant across the batch can't separate candidates
+        scaled = np.where(spread > 0, (features - lo) / np.where(spread > 0, spread, 1), 0.5)
+    weight_vec = np.array([w['brand_fit'], w['engagement'], w['reach'], w['audience_quality'], w['cadence']])
+    scores = scaled @ weight_vec * 100
+    order = np.argsort(-scores, kind='stable')
+    ranked = []
+    for idx in order:
+        candidate = dict(candidates[idx])
+        candidate['rank_score'] = round(float(scores[idx]), 2)
+        ranked.append(candidate)
+    return ranked
+
+def _candidate_basics(item, platform: str):
+    """What the search agent itself says about a candidate; no upstream lookups."""
+    # Process new JSON format with brand_fit_score and summary
+    if isinstance(item, dict):
+        username = item.get('username', '').strip('@')
+        brand_fit_score = item.get('brand_fit_score', 85)
+        summary = item.get('summary', '')
+    else:
+        # Fallback for string format
+        username = str(item).lstrip('@').strip()
+        brand_fit_score = 85
+        summary = ''
+        item = {}
+    if not username:
+        return None
+        
+    platform_final = 'Instagram' if platform.startswith('insta') else ('YouTube' if 'you' in platform else 'Instagram')
+    # Heuristics: if looks like a YouTube Channel ID (UC...) or we were given a channel_id, force YouTube
+    if username.upper().startswith('UC') or item.get('channel_id'):
+        platform_final = 'YouTube'
+    # The agent sometimes sends scores as strings ("64"); rank_influencers only reads numbers
+    try:
+        brand_fit_score = float(brand_fit_score)
+    except (TypeError, ValueError):
+        brand_fit_score = None
+    if brand_fit_score is not None and not math.isfinite(brand_fit_score):
+        brand_fit_score = None
+    return {'username': username, 'platform': platform_final, 'brand_fit_score': brand_fit_score,
+            'summary': summary, 'channel_id': item.get('channel_id') or username}
+
+def _unenriched_candidate(basics: dict) -> dict:
+    """A candidate without profile stats (lookup skipped or failed).
+
+    Metrics are None rather than 0 so rank_influencers treats them as missing and
+    imputes the batch median instead of ranking the candidate last.
+    """
+    username = basics['username']
+    if basics['platform'] == 'Instagram':
+        record_id, profile_url = f"insta_{username}", f"https://instagram.com/{username}"
+    else:
+        record_id, profile_url = f"yt_{basics['channel_id']}", f"https://youtube.com/channel/{basics['channel_id']}"
+    return {
+        'id': record_id,
+        'platform': basics['platform'],
+        'username': username,
+        'name': username,
+        'followers': None,
+        'following': None,
+        'posts': None,
+        'avatar': '',
+        'brand_fit_score': basics['brand_fit_score'],
+        'summary': basics['summary'],
+        'avg_engagement_rate': None,
+        'profile_url': profile_url,
+        'enriched': False,
+    }
+
+def _enrich_candidate(basics: dict):
+    """Resolve one candidate into a full influencer record (runs on the 'enrich' pool)."""
+    username = basics['username']
+    if basics['platform'] == 'Instagram':
+        try:
+            ig = get_instagram_profile(username)
+            return {
+                'id': f"insta_{username}",
+                'platform': 'Instagram',
+                'username': ig.get('username') or username,
+                'name': ig.get('name') or username,
+                'followers': ig.get('followers'),
+                'following': ig.get('following'),
+                'posts': ig.get('posts'),
+                'avatar': ig.get('profile_pic_url', ''),
+                'verified': ig.get('is_verified', False),
+                'biography': ig.get('biography', ''),
+                'brand_fit_score': basics['brand_fit_score'],
+                'summary': basics['summary'],
+                # None when the profile came from the meta-tag fallback (no timeline media)
+                'avg_engagement_rate': ig.get('avg_engagement_rate'),
+                'avg_likes': ig.get('avg_likes'),
+                'avg_comments': ig.get('avg_comments'),
+                'posts_per_week': ig.get('posts_per_week'),
+                'profile_url': f"https://instagram.com/{ig.get('username') or username}",
+                'enriched': True,
+            }
+        except Exception as e:
+            log.warning("IG enrich failed for %s: %s", username, e)
+            return _unenriched_candidate(basics)
+    try:
+        channel_id = basics['channel_id']
+        yt = get_youtube_channel(channel_id)
+        return {
+            'id': f"yt_{channel_id}",
+            'platform': 'YouTube',
+            'username': channel_id,
+            'name': yt.get('channel_name') or channel_id,
+            'followers': int(yt['subscriber_count']) if yt.get('subscriber_count') is not None else None,
+            'following': 0,
+            'posts': int(yt['video_count']) if yt.get('video_count') is not None else None,
+            'avatar': yt.get('profile_picture', ''),
+            'brand_fit_score': basics['brand_fit_score'],
+            'summary': basics['summary'] or (yt.get('description') or ''),
+            'avg_engagement_rate': None,
+            'posts_per_week': _lifetime_posts_per_week(yt.get('video_count'), yt.get('published_at')),
+            'profile_url': f"https://youtube.com/channel/{yt.get('channel_id') or channel_id}",
+            'country': yt.get('country'),
+            'view_count': int(yt.get('view_count') or 0),
+            'published_at': yt.get('published_at'),
+            'enriched': True,
+        }
+    except Exception as e:
+        log.warning("YT enrich failed for %s: %s", username, e)
+        return _unenriched_candidate(basics)
+
+def _enrich_budget(upstream: str, calls_per_profile: int) -> int:
+    """How many profiles one query may look up without queueing past the upstream's rate limit."""
+    bulkhead = UPSTREAMS[upstream]
+    if not bulkhead.rate:
+        return ENRICH_BUDGET
+    # The burst plus whatever refills while a caller may sit in the wait queue
+    affordable = int((bulkhead.burst + bulkhead.rate * bulkhead.queue_timeout) // calls_per_profile)
+    return max(min(ENRICH_BUDGET, affordable), 1)
+
+def _brand_fit(basics: dict) -> float:
+    return basics['brand_fit_score'] if basics['brand_fit_score'] is not None else 0.0
+
 @app.route('/api/fetch_influencers', methods=['POST'])
 def fetch_influencers():
     try:
@@ -470,153 +1527,39 @@ def fetch_influencers():
         if filters.get('platform'): parts.append(str(filters.get('platform')).strip().lower())
         user_query = ", ".join([p for p in parts if p]) or "tech influencers, indian, male"
 
-        # Step 1: Get Access Token (exact flow)
-        token_url = "https://portal.qraptor.ai/auth1/realms/appzyjjakwlasqtu/protocol/openid-connect/token"
-        payload = {
-        "username": os.getenv("QRAPTOR_USERNAME"),
-        "password": os.getenv("QRAPTOR_PASSWORD"),
-        "grant_type": "password",
-        "client_id": os.getenv("QRAPTOR_CLIENT_ID"),
-        "client_secret": os.getenv("QRAPTOR_CLIENT_SECRET")
-    }
-        headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        resp = requests.post(token_url, data=payload, headers=headers)
-        if resp.status_code != 200:
-            return jsonify({'success': False, 'message': f'Token error: {resp.text}'}), 502
-        access_token = resp.json().get("access_token")
-        if not access_token:
-            return jsonify({'success': False, 'message': 'Missing access_token'}), 502
-
-        # Step 2: Call API using Access Token (controller 795) and stream SSE
-        api_url = f"{QRAPTOR_BASE_URL}/api/795/agent-controller/trigger-agent"
-        api_headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json"
-        }
-
-        final_outputs = {}
-        try:
-            with requests.post(api_url, headers=api_headers, json={"user_query": user_query}, stream=True) as sse:
-                for line in sse.iter_lines():
-                    if not line:
-                        continue
-                    text = line.decode("utf-8")
-                    # print("SSE Event:", text)
-                    if text.startswith("SSE Event: data: "):
-                        text = text.replace("SSE Event: data: ", "", 1)
-                    elif text.startswith("data:"):
-                        text = text.replace("data:", "", 1).strip()
-                    try:
-                        j = json.loads(text)
-                        if isinstance(j, dict) and j.get('outputs'):
-                            final_outputs = j['outputs']
-                    except json.JSONDecodeError:
-                        continue
-        except ChunkedEncodingError:
-            # Expected with SSE when server closes connection
-            pass
+        result = call_agent(AGENT_ENDPOINTS['influencer_search'], {"user_query": user_query})
+        final_outputs = (result.get('outputs') if isinstance(result, dict) else None) or {}
 
         platform = (final_outputs.get('platform') or '').strip().lower()
         results = final_outputs.get('results') or []
         if not isinstance(results, list) or not results:
             return jsonify({'success': False, 'message': 'No results from QRaptor'}), 502
 
-        # Process new JSON format with brand_fit_score and summary
-        enriched = []
-        for item in results[:10]:  # Limit to 10 results
-            if isinstance(item, dict):
-                username = item.get('username', '').strip('@')
-                brand_fit_score = item.get('brand_fit_score', 85)
-                summary = item.get('summary', '')
-            else:
-                # Fallback for string format
-                username = str(item).lstrip('@').strip()
-                brand_fit_score = 85
-                summary = ''
-            if not username:
-                continue
-                
-            platform_final = 'Instagram' if platform.startswith('insta') else ('YouTube' if 'you' in platform else 'Instagram')
-            # Heuristics: if looks like a YouTube Channel ID (UC...) or we were given a channel_id, force YouTube
-            if username.upper().startswith('UC') or item.get('channel_id'):
-                platform_final = 'YouTube'
-            
-            if platform_final == 'Instagram':
-                try:
-                    ig = get_instagram_profile(username)
-                    enriched.append({
-                        'id': f"insta_{username}",
-                        'platform': 'Instagram',
-                        'username': ig.get('username') or username,
-                        'name': ig.get('full_name') or username,
-                        'followers': ig.get('followers', 0),
-                        'following': ig.get('following', 0),
-                        'posts': ig.get('posts', 0),
-                        'avatar': ig.get('profile_pic_url', ''),
-                        'verified': ig.get('verified', False),
-                        'biography': ig.get('biography', ''),
-                        'brand_fit_score': brand_fit_score,
-                        'summary': summary,
-                        'avg_engagement_rate': ig.get('avg_engagement_rate', 2.5),
-                        'profile_url': f"https://instagram.com/{ig.get('username') or username}"
-                    })
-                except Exception as e:
-                    print(f"IG enrich failed for {username}: {e}")
-                    enriched.append({
-                        'id': f"insta_{username}",
-                        'platform': 'Instagram',
-                        'username': username,
-                        'name': username,
-                        'followers': 0,
-                        'following': 0,
-                        'posts': 0,
-                        'avatar': '',
-                        'brand_fit_score': brand_fit_score,
-                        'summary': summary,
-                        'avg_engagement_rate': 2.5,
-                        'profile_url': f"https://instagram.com/{username}"
-                    })
+        # Look up profiles only for the agent's best-fitting candidates, within what the
+        # Instagram/YouTube rate limits allow; the rest are ranked on the agent's data alone
+        candidates = [b for b in (_candidate_basics(item, platform) for item in results[:MAX_RANK_CANDIDATES]) if b]
+        candidates.sort(key=_brand_fit, reverse=True)
+        budgets = {'Instagram': _enrich_budget('instagram', 2), 'YouTube': _enrich_budget('youtube', 1)}
+        to_enrich, unenriched = [], []
+        for basics in candidates:
+            if budgets[basics['platform']] > 0:
+                budgets[basics['platform']] -= 1
+                to_enrich.append(basics)
             else:
-                try:
-                    channel_id = item.get('channel_id') or username
-                    yt = get_youtube_channel(channel_id)
-                    enriched.append({
-                        'id': f"yt_{channel_id}",
-                        'platform': 'YouTube',
-                        'username': channel_id,
-                        'name': yt.get('channel_name') or channel_id,
-                        'followers': int(yt.get('subscriber_count') or 0),
-                        'following': 0,
-                        'posts': int(yt.get('video_count') or 0),
-                        'avatar': yt.get('profile_picture', ''),
-                        'brand_fit_score': brand_fit_score,
-                        'summary': summary or (yt.get('description') or ''),
-                        'avg_engagement_rate': 2.5,
-                        'profile_url': f"https://youtube.com/channel/{yt.get('channel_id') or channel_id}",
-                        'country': yt.get('country'),
-                        'view_count': int(yt.get('view_count') or 0),
-                        'published_at': yt.get('published_at')
-                    })
-                except Exception as e:
-                    print(f"YT enrich failed for {username}: {e}")
-                    enriched.append({
-                        'id': f"yt_{username}",
-                        'platform': 'YouTube',
-                        'username': username,
-                        'name': username,
-                        'followers': 0,
-                        'following': 0,
-                        'posts': 0,
-                        'avatar': '',
-                        'brand_fit_score': brand_fit_score,
-                        'summary': summary,
-                        'avg_engagement_rate': 2.5,
-                        'profile_url': f"https://youtube.com/channel/{username}"
-                    })
+                unenriched.append(_unenriched_candidate(basics))
+        enriched = list(_pool('enrich').map(_with_request_context(_enrich_candidate), to_enrich))
+        ranked = rank_influencers(enriched + unenriched, data.get('ranking_weights'))
+        try:
+            limit = max(int(data.get('limit') or DEFAULT_RESULT_LIMIT), 1)
+        except (TypeError, ValueError):
+            limit = DEFAULT_RESULT_LIMIT
 
         global influencer_data
-        influencer_data = enriched
-        return jsonify({'success': True, 'influencers': enriched, 'count': len(enriched)})
+        with _state_lock:
+            influencer_data = ranked
+        _bump_dataset_version()
+        top = ranked[:limit]
+        return jsonify({'success': True, 'influencers': top, 'count': len(top), 'total_candidates': len(ranked)})
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
@@ -631,6 +1574,7 @@ def add_influencers():
         agent_input = {'campaign_id': campaign_id, 'influencer_ids': influencer_ids, 'action': 'add_influencers'}
         result = call_agent('agent_3', agent_input)
         if result:
+            _bump_dataset_version()
             return jsonify({'success': True, 'message': f'Added {len(influencer_ids)} influencers to campaign', 'agent_response': result})
         return jsonify({'success': False, 'message': 'Failed to add influencers via agent'}), 500
     except Exception as e:
@@ -640,7 +1584,7 @@ def add_influencers():
 def fetch_campaign_data():
     try:
         campaign_id = request.args.get('campaign_id')
-        print(f"[FETCH_CAMPAIGN_DATA] Received campaign_id: {campaign_id}")
+        log.info("Fetch campaign data for %s", campaign_id, extra={'campaign_id': campaign_id})
         if not campaign_id or campaign_id not in campaign_data:
             return jsonify({'success': False, 'message': 'Campaign not found'}), 404
         agent_input = {'campaign_id': campaign_id, 'action': 'fetch_campaign_data'}
@@ -665,6 +1609,7 @@ def send_emails():
         agent_input = {'campaign_id': campaign_id, 'influencer_ids': influencer_ids, 'email_template': email_template, 'action': 'send_emails'}
         result = call_agent('agent_5', agent_input)
         if result:
+            _bump_dataset_version()
             return jsonify({'success': True, 'message': f'Emails sent to {len(influencer_ids)} influencers', 'agent_response': result})
         return jsonify({'success': False, 'message': 'Failed to send emails via agent'}), 500
     except Exception as e:
@@ -677,8 +1622,8 @@ def analyze_campaign():
         campaign_id = data.get('campaign_id')
         analysis_type = data.get('analysis_type')
         
-        print(f"[ANALYSIS] Received campaign_id: {campaign_id}, analysis_type: {analysis_type}")
-        print(f"[ANALYSIS] Available campaign_data keys: {list(campaign_data.keys())}")
+        log.info("Analyze campaign %s (%s)", campaign_id, analysis_type,
+                 extra={'campaign_id': campaign_id, 'analysis_type': analysis_type, 'known_campaigns': len(campaign_data)})
         
         if not campaign_id:
             return jsonify({'success': False, 'message': 'Campaign ID is required'}), 400
@@ -701,21 +1646,45 @@ def analyze_campaign():
         # Call QRaptor agent
         analysis_input = {"campaign_id": campaign_id}
         result = call_agent(AGENT_ENDPOINTS[agent_name], analysis_input)
-        print(result)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Analysis result", extra={'campaign_id': campaign_id, 'payload': _summarize(result)})
         if result:
-            global campaign_analysis
-            campaign_analysis[campaign_id] = result
-            global campaign 
-            campaign = result
-            print(campaign)
-            return jsonify({'success': True, 'analysis': result})
+            global campaign
+            with _state_lock:
+                campaign_analysis[campaign_id] = result
+                campaign = result
+            _bump_dataset_version()
+            return jsonify({'success': True, 'analysis': _project(result, _requested_fields())})
         return jsonify({'success': False, 'message': 'Failed to analyze campaign via agent'}), 500
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
 @app.route('/api/get_stored_data')
 def get_stored_data():
-    return jsonify({'campaigns': campaign_data, 'influencers': influencer_data, 'analysis': campaign_analysis})
+    # Snapshot under the lock so concurrent writers can't mutate dicts mid-serialization
+    with _state_lock:
+        snapshot = {'campaigns': dict(campaign_data), 'influencers': list(influencer_data), 'analysis': dict(campaign_analysis)}
+    # ?fields= picks sections; ?limit=&offset= pages each section
+    sections = _requested_fields() or list(snapshot)
+    body = {}
+    pagination = {}
+    try:
+        for name in sections:
+            if name not in snapshot:
+                continue
+            section = snapshot[name]
+            if isinstance(section, dict):
+                page, meta = _paginate(list(section.items()))
+                body[name] = dict(page)
+            else:
+                body[name], meta = _paginate(section)
+            if meta:
+                pagination[name] = meta
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    if pagination:
+        body['pagination'] = pagination
+    return jsonify(body)
 
 @app.route('/api/analysis_summary', methods=['POST'])
 def analysis_summary():
@@ -735,15 +1704,23 @@ def analysis_summary():
         if not agent_key:
             return jsonify({'success': False, 'message': 'Invalid analysis type'}), 400
         
-        print(AGENT_ENDPOINTS[agent_key])
+        log.info("Analysis summary via agent %s", AGENT_ENDPOINTS[agent_key],
+                 extra={'campaign_id': campaign_id, 'controller_id': AGENT_ENDPOINTS[agent_key]})
 
-        result = call_agent(AGENT_ENDPOINTS[agent_key], {"query": campaign})
+        # Prefer this campaign's own analysis: the `campaign` global is last-writer-wins
+        # across every in-flight request in the worker.
+        with _state_lock:
+            query = campaign_analysis.get(campaign_id) or campaign
+        result = call_agent(AGENT_ENDPOINTS[agent_key], {"query": query})
         if not result:
             return jsonify({'success': False, 'message': 'agent failed'}), 502
         
         outputs = result.get('outputs') or {}
         summary = outputs.get('summary') or outputs.get('res') or outputs
-        return jsonify({'success': True, 'summary': summary, 'raw': result})
+        body = {'success': True, 'summary': summary}
+        if _include_raw():
+            body['raw'] = result
+        return jsonify(body)
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
@@ -803,7 +1780,10 @@ def generate_email():
             'subject': outputs.get('subject', ''),
             'body': outputs.get('body', '')
         }
-        return jsonify({'success': True, 'email': email, 'raw': result})
+        body = {'success': True, 'email': email}
+        if _include_raw():
+            body['raw'] = result
+        return jsonify(body)
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
@@ -822,13 +1802,91 @@ def send_email():
             'body': body
         }
         result = call_agent(AGENT_ENDPOINTS['email_sender'], payload)
-        print(result)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Email sender result", extra={'payload': _summarize(result)})
         # if result:
         return jsonify({'success': True})
         # return jsonify({'success': False, 'message': 'Failed to send email'}), 502
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
+# Super Manager answers are cached per normalized query, so the usual repeat
+# questions ("top performing influencers this month") skip a full agent run.
+SUPER_MANAGER_CACHE_TTL = float(os.getenv('SUPER_MANAGER_CACHE_TTL', '600'))  # seconds; 0 disables
+SUPER_MANAGER_CACHE_SIZE = int(os.getenv('SUPER_MANAGER_CACHE_SIZE', '256'))
+
+# Phrases first, then single words; both map to one canonical spelling
+_QUERY_PHRASES = (
+    (re.compile(r'\breturn on (?:investment|spend)\b'), 'roi'),
+    (re.compile(r'\b(?:current|this) month\b'), 'month'),
+    (re.compile(r'\b(?:last|past|previous) month\b'), 'lastmonth'),
+    (re.compile(r'\bengagement rates?\b'), 'engagement'),
+)
+_QUERY_SYNONYMS = {
+    'best': 'top', 'highest': 'top', 'leading': 'top',
+    'performing': 'performance', 'performers': 'performance', 'perform': 'performance',
+    'influencers': 'influencer', 'creators': 'influencer', 'creator': 'influencer',
+    'campaigns': 'campaign',
+    'summarize': 'summary', 'summarise': 'summary', 'overview': 'summary', 'report': 'summary',
+    'monthly': 'month',
+}
+_QUERY_STOPWORDS = {'a', 'an', 'the', 'please', 'me', 'show', 'give', 'tell', 'list',
+                    'what', 'whats', 'are', 'is', 'of', 'for', 'my', 'our', 'can', 'you'}
+
+def normalize_query(query: str) -> str:
+    """Canonical form of a chat query: case, punctuation, whitespace and simple synonyms folded."""
+    text = re.sub(r"[^\w\s]", ' ', str(query).lower().replace("'", ''))
+    text = ' '.join(text.split())
+    for pattern, replacement in _QUERY_PHRASES:
+        text = pattern.sub(replacement, text)
+    words = (_QUERY_SYNONYMS.get(word, word) for word in text.split())
+    return ' '.join(word for word in words if word not in _QUERY_STOPWORDS)
+
+class ResponseCache:
+    """Thread-safe TTL + LRU cache for agent answers."""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        """Return (value, age_seconds), or None on a miss or an expired entry."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now - entry[0] > self.ttl:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], now - entry[0]
+
+    def put(self, key, value):
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'entries': len(self._entries), 'max_entries': self.max_entries,
+                    'ttl': self.ttl, 'hits': self.hits, 'misses': self.misses}
+
+super_manager_cache = ResponseCache(SUPER_MANAGER_CACHE_TTL, SUPER_MANAGER_CACHE_SIZE)
+
+def _cache_bypassed(data: dict) -> bool:
+    if data.get('no_cache') or data.get('cache') is False:
+        return True
+    return 'no-cache' in request.headers.get('Cache-Control', '').lower()
+
 @app.route('/api/super-manager-chat', methods=['POST'])
 def super_manager_chat():
     try:
@@ -837,15 +1895,34 @@ def super_manager_chat():
         if not query:
             return jsonify({'success': False, 'message': 'query is required'}), 400
         
+        # Scoped to the dataset version: new campaign/analysis data makes old keys unreachable.
+        # Without a readable version we can't tell whether an entry is stale, so skip the cache.
+        version = _dataset_version()
+        cache_key = (version, normalize_query(query))
+        if version is not None and not _cache_bypassed(data):
+            hit = super_manager_cache.get(cache_key)
+            if hit:
+                (response, result), age = hit
+                body = {'success': True, 'response': response, 'cached': True, 'cache_age': round(age, 1)}
+                if _include_raw():
+                    body['raw'] = result
+                return jsonify(body)
+        
         payload = {"user_query": query}
-        print(payload)
+        log.info("Super Manager query", extra={'query': _summarize(query, 200)})
         result = call_agent(AGENT_ENDPOINTS['super_manager'], payload)
         if not result:
             return jsonify({'success': False, 'message': 'Super Manager agent failed to respond'}), 502
         
         outputs = result.get('outputs') or {}
         response = outputs.get('response') or outputs.get('answer') or outputs.get('summary') or outputs.get('res') or outputs
-        return jsonify({'success': True, 'response': response, 'raw': result})
+        # A bypassed request still refreshes the entry for everyone else
+        if version is not None:
+            super_manager_cache.put(cache_key, (response, result))
+        body = {'success': True, 'response': response, 'cached': False}
+        if _include_raw():
+            body['raw'] = result
+        return jsonify(body)
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
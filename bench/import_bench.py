@@ -0,0 +1,68 @@
+"""Repeatable cold-start benchmark for the serverless entry point (app.py).
+
+Each run imports app in a fresh interpreter and times the import itself, so
+interpreter startup is excluded. Exits non-zero when the median exceeds the
+target, so it can gate CI or a pre-deploy check.
+
+    python bench/import_bench.py                 # 15 runs, 90 ms target
+    python bench/import_bench.py --profile       # also print the slowest imports (-X importtime)
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TIMER = (
+    "import time; t = time.perf_counter(); import app; "
+    "print((time.perf_counter() - t) * 1000)"
+)
+
+
+def time_import():
+    out = subprocess.run([sys.executable, '-c', TIMER], cwd=ROOT, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def profile(top):
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'],
+                         cwd=ROOT, capture_output=True, text=True, check=True)
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    # -X importtime lists children before their parent, indented two spaces per level;
+    # keep the modules app.py imports directly.
+    indent = [len(name) - len(name.lstrip()) for _, _, name in rows]
+    app_idx = max(i for i, (_, _, name) in enumerate(rows) if name.strip() == 'app')
+    start = max([i + 1 for i in range(app_idx) if indent[i] <= indent[app_idx]], default=0)
+    direct = [(c, s_, name.strip()) for i, (c, s_, name) in enumerate(rows[start:app_idx + 1], start)
+              if indent[i] == indent[app_idx] + 2 or i == app_idx]
+    print(f"{'cumulative ms':>14}{'self ms':>10}  module")
+    for cumulative_us, self_us, name in sorted(direct, reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>14.1f}{self_us / 1000:>10.1f}  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=15)
+    parser.add_argument('--target-ms', type=float, default=90.0)
+    parser.add_argument('--profile', action='store_true')
+    parser.add_argument('--top', type=int, default=12)
+    args = parser.parse_args()
+
+    if args.profile:
+        profile(args.top)
+        print()
+    timings = sorted(time_import() for _ in range(args.runs))
+    median = statistics.median(timings)
+    print(f"import app: median {median:.1f} ms, min {timings[0]:.1f} ms, max {timings[-1]:.1f} ms "
+          f"over {args.runs} runs (target {args.target_ms:.0f} ms)")
+    sys.exit(0 if median <= args.target_ms else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Time rank_influencers() on synthetic candidate batches.
+
+Runs a few correctness checks on missing-feature handling first.
+
+    python bench/ranking_bench.py --sizes 100 500 2000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import rank_influencers  # noqa: E402
+
+
+def synthetic_candidates(n, seed=7):
+    rng = random.Random(seed)
+    candidates = []
+    for i in range(n):
+        followers = int(10 ** rng.uniform(3, 7))
+        measured = rng.random() > 0.2  # ~20% meta-tag fallbacks without timeline stats
+        candidates.append({
+            'id': f'insta_user{i}',
+            'brand_fit_score': rng.randint(50, 99),
+            'followers': followers,
+            'following': rng.randint(0, 5000),
+            'avg_engagement_rate': round(rng.uniform(0.2, 9), 2) if measured else None,
+            'posts_per_week': round(rng.uniform(0, 14), 2) if measured else None,
+        })
+    return candidates
+
+
+def check_missing_features():
+    """A missing feature must score as the batch median, never as a best or worst value."""
+    base = {'brand_fit_score': 80, 'followers': 10000, 'following': 500, 'avg_engagement_rate': 3.0}
+    # Unknown cadence: same score as the only known value, not the cadence cap
+    ranked = rank_influencers([dict(base, id='missing', posts_per_week=None),
+                               dict(base, id='weekly', posts_per_week=1.0)])
+    scores = {c['id']: c['rank_score'] for c in ranked}
+    assert scores['missing'] == scores['weekly'], scores
+    # Unknown followers (failed lookup): median reach, not zero
+    ranked = rank_influencers([dict(base, id='missing', followers=None),
+                               dict(base, id='small', followers=1000),
+                               dict(base, id='large', followers=100000)])
+    assert [c['id'] for c in ranked] == ['large', 'missing', 'small'], ranked
+    print("missing-feature checks passed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 500, 2000])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+    check_missing_features()
+    for size in args.sizes:
+        candidates = synthetic_candidates(size)
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            rank_influencers(candidates)
+            timings.append((time.perf_counter() - start) * 1000)
+        print(f"{size:>6} candidates: median {statistics.median(timings):.2f} ms, max {max(timings):.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""Compare gunicorn sync vs gevent workers on an I/O-bound route.
+
+Starts a fake Qraptor upstream (token endpoint + agent trigger that sleeps for
+--latency seconds), boots gunicorn against app.py with each worker configuration,
+and fires --requests calls at /api/super-manager-chat with --concurrency clients.
+
+    python bench/worker_bench.py --requests 400 --concurrency 200 --latency 0.25
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_fake_upstream(latency):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            if self.path.endswith('/token'):
+                body = {'access_token': 'bench-token'}
+            else:
+                time.sleep(latency)
+                body = {'outputs': {'response': 'ok'}}
+            data = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    ThreadingHTTPServer.daemon_threads = True
+    ThreadingHTTPServer.request_queue_size = 1024
+    server = ThreadingHTTPServer(('127.0.0.1', _free_port()), Handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_gunicorn(worker_class, workers, upstream_port, extra_env=None):
+    port = _free_port()
+    env = dict(os.environ)
+    env.update(extra_env or {})
+    env.update({
+        'QRAPTOR_BASE_URL': f'http://127.0.0.1:{upstream_port}',
+        'QRAPTOR_TOKEN_URL': f'http://127.0.0.1:{upstream_port}/token',
+        'GUNICORN_BIND': f'127.0.0.1:{port}',
+        'GUNICORN_WORKER_CLASS': worker_class,
+        'WEB_CONCURRENCY': str(workers),
+    })
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--log-level', 'warning', 'app:app'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base = f'http://127.0.0.1:{port}'
+    for _ in range(100):
+        try:
+            requests.get(base + '/api/get_stored_data', timeout=1)
+            return proc, base
+        except requests.RequestException:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError(f'gunicorn ({worker_class}) did not start')
+
+
+def run_load(base, total, concurrency):
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=concurrency)
+    session.mount('http://', adapter)
+
+    def one(_):
+        start = time.perf_counter()
+        # no_cache: every request must reach the (fake) agent, or this measures the answer cache
+        resp = session.post(base + '/api/super-manager-chat', json={'query': 'bench', 'no_cache': True}, timeout=300)
+        return time.perf_counter() - start, resp.status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(total)))
+    wall = time.perf_counter() - started
+    latencies = sorted(r[0] for r in results)
+    errors = sum(1 for r in results if r[1] != 200)
+    return {
+        'rps': total / wall,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        'errors': errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.25, help='fake agent latency in seconds')
+    args = parser.parse_args()
+
+    upstream = start_fake_upstream(args.latency)
+    # The qraptor bulkhead (UPSTREAM_LIMITS in app.py) caps in-flight agent calls per
+    # worker at 50, i.e. ~50 / latency req/s; the last row lifts it to show the worker alone
+    unbounded = {'UPSTREAM_QRAPTOR_CONCURRENCY': '500'}
+    configs = [('sync', 1, None, 'sync x1'), ('sync', 4, None, 'sync x4'), ('gevent', 1, None, 'gevent x1'),
+               ('gevent', 1, unbounded, 'gevent x1 *')]
+    print(f"{args.requests} requests, {args.concurrency} concurrent clients, "
+          f"{args.latency * 1000:.0f} ms upstream latency")
+    print(f"{'worker':<12}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}")
+    for worker_class, workers, extra_env, label in configs:
+        proc, base = start_gunicorn(worker_class, workers, upstream.server_port, extra_env)
+        try:
+            stats = run_load(base, args.requests, args.concurrency)
+        finally:
+            proc.terminate()
+            proc.wait()
+        print(f"{label:<12}{stats['rps']:>10.1f}{stats['p50_ms']:>10.0f}{stats['p95_ms']:>10.0f}{stats['errors']:>8}")
+    print("* qraptor bulkhead raised to 500 concurrent calls (UPSTREAM_QRAPTOR_CONCURRENCY)")
+    upstream.shutdown()
+
+
+if __name__ == '__main__':
+    main()
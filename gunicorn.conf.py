@@ -0,0 +1,23 @@
+# Gunicorn configuration, picked up automatically when gunicorn runs from the repo root:
+#
+#   gunicorn app:app
+#
+# Defaults to gevent workers: every route spends its time blocked on upstream I/O
+# (Qraptor SSE streams, Instagram scraping, CDN image proxying), and with cooperative
+# sockets a single worker process keeps hundreds of those requests in flight.
+# Set GUNICORN_WORKER_CLASS=sync to fall back to the classic one-request-per-worker mode.
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '8000')}")
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gevent')
+workers = int(os.getenv('WEB_CONCURRENCY', min(multiprocessing.cpu_count(), 4)))
+# Max simultaneous clients per gevent worker (ignored by sync workers)
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '1000'))
+# Agent runs can stream for up to a minute; leave headroom above call_agent's timeouts
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = 30
+keepalive = 5
+# Do not preload: the gevent worker must monkey-patch before app.py creates its
+# connection pool and locks.
+preload_app = False
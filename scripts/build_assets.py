@@ -0,0 +1,297 @@
+"""Build fingerprinted, minified and precompressed static assets.
+
+Reads the sources under static/ (js/, css/, images/) and writes to static/dist/:
+
+  * <name>.<hash>.<ext>   minified JS/CSS and optimized images, named by content hash
+  * <file>.gz / <file>.br precompressed variants of text assets (brotli if installed)
+  * <name>.<hash>.webp    WebP variants of PNG images (Pillow if installed)
+  * manifest.json         source path -> hashed path, read by asset_url() in app.py
+
+Run it before deploying; templates fall back to the unhashed files when
+static/dist/manifest.json is missing.
+
+    python scripts/build_assets.py
+"""
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATIC_DIR = os.path.join(ROOT, 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+SOURCE_DIRS = ('js', 'css', 'images')
+
+# Slider screenshots render at most 650 CSS px wide; keep 2x for high-DPI screens
+IMAGE_MAX_WIDTH = 1300
+WEBP_QUALITY = 85
+# Precompressing tiny files costs more in headers than it saves
+COMPRESS_MIN_BYTES = 1024
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+# --- minifiers --------------------------------------------------------------
+# Conservative by design: comments and indentation go, but line breaks between
+# statements are kept so automatic semicolon insertion behaves exactly as before.
+
+_WORD = re.compile(r'[\w$\u0080-\uffff]')
+_REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete',
+                   'void', 'throw', 'instanceof', 'yield', 'await'}
+
+
+def _scan_quoted(src, i):
+    """Return the index just past the string/template literal starting at src[i]."""
+    quote = src[i]
+    j = i + 1
+    while j < len(src):
+        c = src[j]
+        if c == '\\':
+            j += 2
+            continue
+        if c == quote:
+            return j + 1
+        if quote == '`' and src.startswith('${', j):
+            j = _scan_braces(src, j + 2)
+            continue
+        if c == '\n' and quote != '`':
+            return j  # unterminated; leave the rest to the caller
+        j += 1
+    return j
+
+
+def _scan_braces(src, j):
+    """Skip a `${ ... }` template expression, returning the index past its closing brace."""
+    depth = 1
+    while j < len(src) and depth:
+        c = src[j]
+        if c in '\'"`':
+            j = _scan_quoted(src, j)
+            continue
+        if c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+        j += 1
+    return j
+
+
+def _scan_regex(src, i):
+    j = i + 1
+    in_class = False
+    while j < len(src) and src[j] != '\n':
+        c = src[j]
+        if c == '\\':
+            j += 2
+            continue
+        if c == '[':
+            in_class = True
+        elif c == ']':
+            in_class = False
+        elif c == '/' and not in_class:
+            j += 1
+            while j < len(src) and _WORD.match(src[j]):
+                j += 1
+            return j
+        j += 1
+    return j
+
+
+def _regex_allowed(out):
+    text = ''.join(out[-3:]).rstrip()
+    if not text:
+        return True
+    last = text[-1]
+    if _WORD.match(last):
+        word = re.search(r'[\w$]+$', ''.join(out[-20:]))
+        return bool(word) and word.group(0) in _REGEX_KEYWORDS
+    return last not in ')]'
+
+
+def minify_js(src):
+    out = []
+    pending = None  # whitespace seen since the last token: None, ' ' or '\n'
+    i, n = 0, len(src)
+    while i < n:
+        c = src[i]
+        if c in ' \t\r\n':
+            j = i
+            while j < n and src[j] in ' \t\r\n':
+                j += 1
+            pending = '\n' if '\n' in src[i:j] or pending == '\n' else ' '
+            i = j
+            continue
+        if src.startswith('//', i):
+            end = src.find('\n', i)
+            i = n if end < 0 else end
+            continue
+        if src.startswith('/*', i):
+            end = src.find('*/', i + 2)
+            end = n if end < 0 else end + 2
+            comment = src[i:end]
+            if comment.startswith('/*!'):
+                out.append(comment)
+            elif pending != '\n':
+                pending = '\n' if '\n' in comment else ' '
+            i = end
+            continue
+
+        if pending and out:
+            prev = out[-1][-1]
+            if pending == '\n':
+                out.append('\n')
+            elif (_WORD.match(prev) and _WORD.match(c)) or (prev in '+-' and c in '+-'):
+                out.append(' ')
+        pending = None
+
+        if c in '\'"`':
+            j = _scan_quoted(src, i)
+        elif c == '/' and _regex_allowed(out):
+            j = _scan_regex(src, i)
+        else:
+            j = i + 1
+        out.append(src[i:j])
+        i = j
+    return ''.join(out).strip() + '\n'
+
+
+def minify_css(src):
+    out = []
+    i, n = 0, len(src)
+    while i < n:
+        c = src[i]
+        if src.startswith('/*', i):
+            end = src.find('*/', i + 2)
+            i = n if end < 0 else end + 2
+            out.append(' ')
+            continue
+        if c in '\'"':
+            j = i + 1
+            while j < n and src[j] != c:
+                j += 2 if src[j] == '\\' else 1
+            out.append(src[i:j + 1])
+            i = j + 1
+            continue
+        out.append(c)
+        i += 1
+    css = ''.join(out)
+    # Strings were copied verbatim above; protect them from the whitespace rules
+    strings = []
+
+    def stash(m):
+        strings.append(m.group(0))
+        return f'\x00{len(strings) - 1}\x00'
+
+    css = re.sub(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'', stash, css)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    css = css.replace(';}', '}')
+    css = re.sub(r'\x00(\d+)\x00', lambda m: strings[int(m.group(1))], css)
+    return css.strip() + '\n'
+
+
+# --- build ------------------------------------------------------------------
+
+def _hashed_name(rel_path, data, ext=None):
+    stem, source_ext = os.path.splitext(rel_path)
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    return f"{stem}.{digest}{ext or source_ext}"
+
+
+def _write(rel_path, data):
+    path = os.path.join(DIST_DIR, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def _write_compressed(rel_path, data):
+    if len(data) < COMPRESS_MIN_BYTES:
+        return
+    _write(rel_path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        _write(rel_path + '.br', brotli.compress(data, quality=11))
+
+
+def _optimize_png(data):
+    """Downscale oversized images and re-encode; returns (png_bytes, webp_bytes or None)."""
+    if Image is None:
+        return data, None
+    image = Image.open(io.BytesIO(data))
+    if image.width > IMAGE_MAX_WIDTH:
+        height = round(image.height * IMAGE_MAX_WIDTH / image.width)
+        image = image.resize((IMAGE_MAX_WIDTH, height), Image.LANCZOS)
+    png = io.BytesIO()
+    image.save(png, 'PNG', optimize=True)
+    webp = io.BytesIO()
+    image.save(webp, 'WEBP', quality=WEBP_QUALITY, method=6)
+    png_bytes = png.getvalue()
+    # Re-encoding (especially after a resample) can grow a screenshot PNG; the WebP
+    # variant is where the savings are, so fall back to the original bytes then
+    if len(png_bytes) >= len(data):
+        png_bytes = data
+    return png_bytes, webp.getvalue()
+
+
+def build():
+    if os.path.isdir(DIST_DIR):
+        shutil.rmtree(DIST_DIR)
+    manifest = {}
+    totals = {'source': 0, 'output': 0, 'gzip': 0}
+    for source_dir in SOURCE_DIRS:
+        for dirpath, _, filenames in os.walk(os.path.join(STATIC_DIR, source_dir)):
+            for filename in sorted(filenames):
+                path = os.path.join(dirpath, filename)
+                rel_path = os.path.relpath(path, STATIC_DIR).replace(os.sep, '/')
+                with open(path, 'rb') as f:
+                    data = f.read()
+                ext = os.path.splitext(filename)[1].lower()
+                if ext == '.js':
+                    out = minify_js(data.decode('utf-8')).encode('utf-8')
+                elif ext == '.css':
+                    out = minify_css(data.decode('utf-8')).encode('utf-8')
+                elif ext == '.png':
+                    out, webp = _optimize_png(data)
+                    if webp is not None:
+                        webp_rel = os.path.splitext(rel_path)[0] + '.webp'
+                        manifest[webp_rel] = _hashed_name(rel_path, webp, '.webp')
+                        _write(manifest[webp_rel], webp)
+                        print(f"{webp_rel:<34} {len(data):>9,} -> {len(webp):>9,}  {manifest[webp_rel]}")
+                else:
+                    out = data
+                hashed = _hashed_name(rel_path, out)
+                manifest[rel_path] = hashed
+                _write(hashed, out)
+                if ext in ('.js', '.css', '.svg'):
+                    _write_compressed(hashed, out)
+                    gz_path = os.path.join(DIST_DIR, hashed + '.gz')
+                    totals['gzip'] += os.path.getsize(gz_path) if os.path.exists(gz_path) else len(out)
+                totals['source'] += len(data)
+                totals['output'] += len(out)
+                print(f"{rel_path:<34} {len(data):>9,} -> {len(out):>9,}  {hashed}")
+
+    with open(os.path.join(DIST_DIR, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    print(f"\n{len(manifest)} assets, {totals['source']:,} -> {totals['output']:,} bytes "
+          f"(text assets {totals['gzip']:,} bytes gzipped)")
+    if brotli is None:
+        print("brotli not installed: skipped .br variants (pip install brotli)", file=sys.stderr)
+    if Image is None:
+        print("Pillow not installed: images copied unoptimized (pip install Pillow)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    build()
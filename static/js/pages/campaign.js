@@ -0,0 +1,321 @@
+// Campaign management functions
+function showCreateModal() {
+    document.getElementById('createCampaignModal').style.display = 'flex';
+    document.body.style.overflow = 'hidden';
+}
+
+function hideCreateModal() {
+    document.getElementById('createCampaignModal').style.display = 'none';
+    document.body.style.overflow = 'auto';
+}
+
+function showCampaignDetailsModal(campaignId) {
+    document.getElementById('campaignDetailsModal').style.display = 'flex';
+    document.body.style.overflow = 'hidden';
+    loadCampaignDetails(campaignId);
+}
+
+function hideCampaignDetailsModal() {
+    document.getElementById('campaignDetailsModal').style.display = 'none';
+    document.body.style.overflow = 'auto';
+}
+
+function saveAsDraft(){
+    const data = new FormData(document.getElementById('campaignForm'));
+    const obj = {};
+    for(const [k,v] of data.entries()){ obj[k] = v }
+    localStorage.setItem('campaignDraft', JSON.stringify(obj));
+    showNotification('Draft saved', 'success');
+}
+
+function loadCampaigns() {
+    const campaignsList = document.getElementById('campaignsList');
+
+    fetch('/api/list_campaigns')
+        .then(response => response.json())
+        .then(data => {
+            if (data.success && data.campaigns) {
+                displayCampaigns(data.campaigns);
+            } else {
+                campaignsList.innerHTML = '<p class="text-center">No campaigns found.</p>';
+            }
+        })
+        .catch(error => {
+            console.error('Error loading campaigns:', error);
+            campaignsList.innerHTML = '<p class="text-center text-error">Error loading campaigns. Please try again.</p>';
+        });
+}
+
+function displayCampaigns(campaigns) {
+    const campaignsList = document.getElementById('campaignsList');
+
+    if (campaigns.length === 0) {
+        campaignsList.innerHTML = '<p class="text-center">No campaigns found. Create your first campaign!</p>';
+        return;
+    }
+
+    const campaignsGrid = document.createElement('div');
+    campaignsGrid.className = 'campaigns-grid-improved';
+
+    campaigns.forEach(campaign => {
+        const campaignCard = createCampaignCard(campaign);
+        campaignsGrid.appendChild(campaignCard);
+    });
+
+    campaignsList.innerHTML = '';
+    campaignsList.appendChild(campaignsGrid);
+}
+
+function createCampaignCard(campaign) {
+    const card = document.createElement('div');
+    card.className = 'campaign-card-improved fade-in-up';
+
+    const createdDate = campaign.created_on ? new Date(campaign.created_on).toLocaleDateString() : 'Not specified';
+    const status = campaign.status || 'Active';
+    const statusClass = status.toLowerCase() === 'active' ? 'status-active' : 'status-inactive';
+
+    card.innerHTML = `
+        <div class="campaign-card-header">
+            <div class="campaign-title-section">
+            <h3 class="campaign-name">${campaign.campaign_name || 'Unnamed Campaign'}</h3>
+                <span class="campaign-id">#${campaign.campaign_id || 'N/A'}</span>
+            </div>
+            <div class="campaign-status">
+                <span class="status-badge ${statusClass}">${status}</span>
+            </div>
+        </div>
+        <div class="campaign-card-body">
+            <div class="campaign-info-grid">
+                <div class="info-item">
+                    <i class="fas fa-building"></i>
+                    <span><strong>Brand:</strong> ${campaign.brand_name || 'Not specified'}</span>
+                </div>
+                <div class="info-item">
+                    <i class="fas fa-bullseye"></i>
+                    <span><strong>Goal:</strong> ${campaign.goal || 'Not specified'}</span>
+                </div>
+                <div class="info-item">
+                    <i class="fas fa-tags"></i>
+                    <span><strong>Niche:</strong> ${campaign.niche || 'Not specified'}</span>
+                </div>
+                <div class="info-item">
+                    <i class="fas fa-globe"></i>
+                    <span><strong>Platform:</strong> ${campaign.platform || 'Not specified'}</span>
+                </div>
+                <div class="info-item">
+                    <i class="fas fa-indian-rupee-sign"></i>
+                    <span><strong>Budget:</strong> ₹${campaign.budget || 'Not specified'}</span>
+                </div>
+                <div class="info-item">
+                    <i class="fas fa-users"></i>
+                    <span><strong>Target:</strong> ${campaign.target_audience || 'Not specified'}</span>
+                </div>
+                <div class="info-item">
+                    <i class="fas fa-calendar"></i>
+                    <span><strong>Created:</strong> ${createdDate}</span>
+                </div>
+            </div>
+        </div>
+        <div class="campaign-card-footer">
+            <button class="btn btn-secondary" onclick="showCampaignDetailsModal('${campaign.campaign_id}')">
+                <i class="fas fa-eye"></i> View Details
+                </button>
+            <button class="btn btn-primary" onclick="editCampaign('${campaign.campaign_id}')">
+                    <i class="fas fa-edit"></i> Edit
+                </button>
+        </div>
+    `;
+
+    return card;
+}
+
+async function loadCampaignDetails(campaignId) {
+    try {
+        // Load campaign details
+        const campaignResponse = await fetch(`/api/list_campaigns`);
+        const campaignData = await campaignResponse.json();
+
+        if (campaignData.success && campaignData.campaigns) {
+            const campaign = campaignData.campaigns.find(c => c.campaign_id == campaignId);
+            if (campaign) {
+                displayCampaignDetails(campaign);
+                // Load influencers for this campaign
+                await loadCampaignInfluencers(campaignId);
+            }
+        }
+    } catch (error) {
+        console.error('Error loading campaign details:', error);
+        showNotification('Error loading campaign details', 'error');
+    }
+}
+
+function displayCampaignDetails(campaign) {
+    const modalTitle = document.getElementById('modalCampaignName');
+    const detailsContent = document.getElementById('campaignDetailsContent');
+
+    modalTitle.textContent = campaign.campaign_name || 'Campaign Details';
+
+    const createdDate = campaign.created_on ? new Date(campaign.created_on).toLocaleDateString() : 'Not specified';
+
+    detailsContent.innerHTML = `
+        <div class="campaign-details-grid">
+            <div class="detail-section">
+                <h4><i class="fas fa-info-circle"></i> Basic Information</h4>
+                <div class="detail-item">
+                    <span class="detail-label">Campaign ID:</span>
+                    <span class="detail-value">#${campaign.campaign_id || 'N/A'}</span>
+                </div>
+                <div class="detail-item">
+                    <span class="detail-label">Brand Name:</span>
+                    <span class="detail-value">${campaign.brand_name || 'Not specified'}</span>
+                </div>
+                <div class="detail-item">
+                    <span class="detail-label">Goal:</span>
+                    <span class="detail-value">${campaign.goal || 'Not specified'}</span>
+                </div>
+                <div class="detail-item">
+                    <span class="detail-label">Niche:</span>
+                    <span class="detail-value">${campaign.niche || 'Not specified'}</span>
+                </div>
+            </div>
+            <div class="detail-section">
+                <h4><i class="fas fa-settings"></i> Campaign Settings</h4>
+                <div class="detail-item">
+                    <span class="detail-label">Platform:</span>
+                    <span class="detail-value">${campaign.platform || 'Not specified'}</span>
+                </div>
+                <div class="detail-item">
+                    <span class="detail-label">Budget:</span>
+                    <span class="detail-value">₹${campaign.budget || 'Not specified'}</span>
+                </div>
+                <div class="detail-item">
+                    <span class="detail-label">Target Audience:</span>
+                    <span class="detail-value">${campaign.target_audience || 'Not specified'}</span>
+                </div>
+                <div class="detail-item">
+                    <span class="detail-label">Created On:</span>
+                    <span class="detail-value">${createdDate}</span>
+                </div>
+            </div>
+        </div>
+    `;
+}
+
+async function loadCampaignInfluencers(campaignId) {
+    try {
+        // For now, we'll show a placeholder since we need to implement the API
+        const influencersList = document.getElementById('influencersList');
+        influencersList.innerHTML = `
+            <div class="no-influencers">
+                <i class="fas fa-users-slash"></i>
+                <p>No influencers assigned to this campaign yet.</p>
+                <button class="btn btn-primary" onclick="window.location.href='/results?campaign_id=${campaignId}'">
+                    <i class="fas fa-search"></i> Find Influencers
+                </button>
+            </div>
+        `;
+
+        // TODO: Implement actual API call to get influencers for this campaign
+        // const response = await fetch(`/api/campaign_influencers/${campaignId}`);
+        // const data = await response.json();
+        // if (data.success && data.influencers) {
+        //     displayInfluencers(data.influencers);
+        // }
+    } catch (error) {
+        console.error('Error loading influencers:', error);
+        const influencersList = document.getElementById('influencersList');
+        influencersList.innerHTML = '<p class="text-error">Error loading influencers</p>';
+    }
+}
+
+function editCampaign(campaignId) {
+    // TODO: Implement edit functionality
+    showNotification('Edit functionality coming soon!', 'info');
+}
+
+function showNotification(message, type = 'info') {
+    const notification = document.createElement('div');
+    notification.className = `notification notification-${type}`;
+    notification.textContent = message;
+    notification.style.cssText = `
+        position: fixed;
+        top: 20px;
+        right: 20px;
+        padding: 1rem 1.5rem;
+        background: ${type === 'success' ? '#10b981' : type === 'error' ? '#ef4444' : '#8b5cf6'};
+        color: white;
+        border-radius: 8px;
+        z-index: 10000;
+        animation: slideInRight 0.3s ease;
+    `;
+
+    document.body.appendChild(notification);
+
+    setTimeout(() => {
+        notification.remove();
+    }, 5000);
+}
+
+// Initialize page
+document.addEventListener('DOMContentLoaded', () => {
+    // Load existing campaigns
+    loadCampaigns();
+
+    // Load draft if exists
+    const d = localStorage.getItem('campaignDraft');
+    if (d) {
+        const o = JSON.parse(d);
+        Object.keys(o).forEach(k => {
+            const el = document.querySelector(`[name="${k}"]`);
+            if (el) el.value = o[k];
+        });
+    }
+
+    // Add form submit handler
+    document.getElementById('campaignForm').addEventListener('submit', handleCampaignSubmit);
+});
+
+async function handleCampaignSubmit(event) {
+    event.preventDefault();
+
+    const form = event.target;
+    const formData = new FormData(form);
+    const payload = {};
+
+    for (const [key, value] of formData.entries()) {
+        payload[key] = value;
+    }
+
+    try {
+        const response = await fetch('/api/create_campaign', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify(payload)
+        });
+
+        const result = await response.json();
+
+        if (result.success) {
+            showNotification('Campaign created successfully!', 'success');
+
+            // Clear form
+            form.reset();
+
+            // Clear draft
+            localStorage.removeItem('campaignDraft');
+
+            // Hide modal and reload campaigns
+            setTimeout(() => {
+                hideCreateModal();
+                loadCampaigns();
+            }, 1500);
+        } else {
+            showNotification(result.message || 'Failed to create campaign', 'error');
+        }
+    } catch (error) {
+        console.error('Error creating campaign:', error);
+        showNotification('An error occurred while creating the campaign', 'error');
+    }
+}
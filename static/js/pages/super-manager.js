@@ -0,0 +1,141 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const chatForm = document.getElementById('chatForm');
+    const chatInput = document.getElementById('chatInput');
+    const chatMessages = document.getElementById('chatMessages');
+    const sendBtn = document.getElementById('sendBtn');
+
+    chatForm.addEventListener('submit', async function(e) {
+        e.preventDefault();
+
+        const query = chatInput.value.trim();
+        if (!query) return;
+
+        // Add user message
+        addMessage(query, 'user');
+        chatInput.value = '';
+
+        // Show typing indicator
+        const typingIndicator = showTypingIndicator();
+
+        // Disable send button
+        sendBtn.disabled = true;
+        sendBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Sending...';
+
+        try {
+            const response = await fetch('/api/super-manager-chat', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({ query: query })
+            });
+
+            const data = await response.json();
+
+            // Remove typing indicator
+            typingIndicator.remove();
+
+            if (data.success) {
+                // Parse the response from the outputs variable
+                let responseText = '';
+                if (data.raw && data.raw.outputs) {
+                    // First try to get the direct output value
+                    if (data.raw.outputs.output) {
+                        responseText = data.raw.outputs.output;
+                    } else if (data.raw.outputs.response) {
+                        responseText = data.raw.outputs.response;
+                    } else if (data.raw.outputs.answer) {
+                        responseText = data.raw.outputs.answer;
+                    } else if (data.raw.outputs.summary) {
+                        responseText = data.raw.outputs.summary;
+                    } else if (data.raw.outputs.res) {
+                        responseText = data.raw.outputs.res;
+                    } else {
+                        // If no direct output, show the temp data if available
+                        if (data.raw.outputs.temp && Array.isArray(data.raw.outputs.temp) && data.raw.outputs.temp.length > 0) {
+                            const tempData = data.raw.outputs.temp[0];
+                            responseText = `Here's what I found:\n\n`;
+                            Object.entries(tempData).forEach(([key, value]) => {
+                                if (key !== 'campaign_id') {
+                                    const formattedKey = key.replace(/_/g, ' ').replace(/\b\w/g, l => l.toUpperCase());
+                                    responseText += `**${formattedKey}:** ${value}\n`;
+                                }
+                            });
+                        } else {
+                            responseText = JSON.stringify(data.raw.outputs);
+                        }
+                    }
+                } else if (data.response) {
+                    responseText = data.response;
+                } else {
+                    responseText = 'I received a response but couldn\'t parse it properly.';
+                }
+                addMessage(responseText, 'bot');
+            } else {
+                addMessage(`Sorry, I encountered an error: ${data.message}`, 'bot');
+            }
+        } catch (error) {
+            // Remove typing indicator
+            typingIndicator.remove();
+            addMessage('Sorry, I encountered an error. Please try again.', 'bot');
+        } finally {
+            // Re-enable send button
+            sendBtn.disabled = false;
+            sendBtn.innerHTML = '<i class="fas fa-paper-plane"></i> Send';
+        }
+    });
+
+    function addMessage(content, sender) {
+        const messageDiv = document.createElement('div');
+        messageDiv.className = `message ${sender}`;
+
+        const avatar = document.createElement('div');
+        avatar.className = 'message-avatar';
+        avatar.innerHTML = sender === 'user' ? '<i class="fas fa-user"></i>' : '<i class="fas fa-robot"></i>';
+
+        const messageContent = document.createElement('div');
+        messageContent.className = 'message-content';
+
+        // Format the content with markdown-like formatting
+        if (sender === 'bot') {
+            // Convert **text** to <strong>text</strong>
+            let formattedContent = content.replace(/\*\*(.*?)\*\*/g, '<strong>$1</strong>');
+            // Convert \n to <br> for line breaks
+            formattedContent = formattedContent.replace(/\n/g, '<br>');
+            messageContent.innerHTML = formattedContent;
+        } else {
+            messageContent.textContent = content;
+        }
+
+        messageDiv.appendChild(avatar);
+        messageDiv.appendChild(messageContent);
+
+        chatMessages.appendChild(messageDiv);
+        chatMessages.scrollTop = chatMessages.scrollHeight;
+    }
+
+    function showTypingIndicator() {
+        const typingDiv = document.createElement('div');
+        typingDiv.className = 'message bot';
+        typingDiv.innerHTML = `
+            <div class="message-avatar">
+                <i class="fas fa-robot"></i>
+            </div>
+            <div class="typing-indicator">
+                <span class="typing-text">Super Manager is thinking...</span>
+                <div class="typing-dots">
+                    <div class="typing-dot"></div>
+                    <div class="typing-dot"></div>
+                    <div class="typing-dot"></div>
+                </div>
+            </div>
+        `;
+
+        chatMessages.appendChild(typingDiv);
+        chatMessages.scrollTop = chatMessages.scrollHeight;
+        return typingDiv;
+    }
+
+    // Focus on input when page loads
+    chatInput.focus();
+});